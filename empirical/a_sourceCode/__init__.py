@@ -1,10 +1,25 @@
 from a_sourceCode.i_web_scraper import (
     verify_url,
+    PlaceSession,
     get_address,
     snap_to_top_of_page,
     expand_all_reviews,
+    expand_see_more_buttons,
+    ScrollEngine,
+    ScrollStats,
     get_reviews,
+    iter_reviews,
+    ReviewWatermark,
+    review_fingerprint,
+    parse_reviews_html,
+    parse_review_dump,
+    parse_review_dumps,
+    parse_page_address,
+    reparse_snapshots,
+    place_key,
     parse_relative_date,
+    resolve_relative_dates,
+    resolve_review_dates,
 )
 
 from a_sourceCode.ii_stage_data import save_to_csv
@@ -19,11 +34,26 @@ from a_sourceCode.iii_data_pre_processing import (
 # indicates which names should be exported when a user imports your module using the from <module> import * syntax.
 __all__ = [
     verify_url,
+    PlaceSession,
     get_address,
     snap_to_top_of_page,
     expand_all_reviews,
+    expand_see_more_buttons,
+    ScrollEngine,
+    ScrollStats,
     get_reviews,
+    iter_reviews,
+    ReviewWatermark,
+    review_fingerprint,
+    parse_reviews_html,
+    parse_review_dump,
+    parse_review_dumps,
+    parse_page_address,
+    reparse_snapshots,
+    place_key,
     parse_relative_date,
+    resolve_relative_dates,
+    resolve_review_dates,
     save_to_csv,
     csv_to_df,
     remove_alphabetic_chars,
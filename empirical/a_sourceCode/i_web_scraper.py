@@ -1,18 +1,22 @@
 import sys
 import os
-import traceback
+import glob
+import gzip
+import html
+import functools
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 import time
+import hashlib
 from bs4 import BeautifulSoup
-from typing import Iterable, Tuple, List
-from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Tuple, List, Optional
+from datetime import date, datetime, timedelta
 import re
 
 # ----
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -20,7 +24,10 @@ from selenium.webdriver.support import expected_conditions as EC
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from b_utils.helper import get_directory_name
+from b_utils.checkpoint import RESUME_OVERLAP, ScrapeCheckpoint
 from b_utils.logger import Logger
+from b_utils.scrape_metrics import count, timed_phase
+from b_utils.snapshot_archive import SnapshotArchive, SnapshotRecord
 
 abs_path = get_directory_name(
     "/Users/ericklopez/Desktop/django_gun/empirical/a_sourceCode"
@@ -28,6 +35,7 @@ abs_path = get_directory_name(
 inspector_gadget = Logger(abs_path)
 
 
+@timed_phase("verify_url")
 def verify_url(driver, url: str, expected_url: str) -> str:
     """Verify current URL matches expected pattern.
 
@@ -43,7 +51,12 @@ def verify_url(driver, url: str, expected_url: str) -> str:
         AssertionError: If URL verification fails
     """
     driver.get(url)
-    current_url = driver.current_url.lower()
+    return _check_url(driver.current_url, expected_url)
+
+
+def _check_url(current_url: str, expected_url: str) -> str:
+    """Raises AssertionError unless current_url starts with expected_url."""
+    current_url = current_url.lower()
 
     patterns = [
         f"https://www.{expected_url.lower()}",
@@ -63,6 +76,13 @@ def verify_url(driver, url: str, expected_url: str) -> str:
 def get_address(driver, url: str, expected_url: str) -> str:
     """Get address from Google Maps page."""
     verify_url(driver, url, expected_url)
+    return _read_address(driver)
+
+
+@timed_phase("get_address")
+def _read_address(driver) -> str:
+    """Reads the address from the Overview tab of the place already loaded."""
+    address = None
 
     # ==========Click Overview Button==========
     try:
@@ -94,6 +114,7 @@ def get_address(driver, url: str, expected_url: str) -> str:
     return address
 
 
+@timed_phase("snap_to_top_of_page")
 def snap_to_top_of_page(driver):
     """Returns to Top of Page"""
     # Snap to top
@@ -105,7 +126,251 @@ def snap_to_top_of_page(driver):
     print("Snaped to Top of Page Complete.")
 
 
-def expand_all_reviews(driver, url: str, expected_url: str, max_attempts=30):
+# Resolves as soon as the review list grows past `previous` (and the loading
+# spinner is gone), or after max_wait seconds, whichever comes first.
+WAIT_FOR_REVIEWS_JS = """
+const [container, previous, minWait, maxWait] = arguments;
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const count = () => container.querySelectorAll("div.jftiEf").length;
+const loading = () => document.querySelector('div[aria-label="Loading..."]') !== null;
+let observer = null;
+let timer = null;
+let finished = false;
+const finish = (reason) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    done({count: count(), loading: loading(), reason: reason});
+};
+const check = () => {
+    if (performance.now() - started < minWait * 1000) return;
+    if (count() > previous && !loading()) finish("grew");
+};
+observer = new MutationObserver(check);
+observer.observe(container, {childList: true, subtree: true});
+timer = setTimeout(() => finish("timeout"), maxWait * 1000);
+setTimeout(check, minWait * 1000);
+"""
+
+
+# Clicks every "See more" button not handled yet in one round trip and tags it,
+# so later passes skip buttons that were already expanded.
+EXPAND_SEE_MORE_JS = """
+const root = arguments[0] || document;
+const buttons = root.querySelectorAll(
+    'button[aria-label^="See more"]:not([data-scraper-expanded])'
+);
+let expanded = 0;
+for (const button of buttons) {
+    button.setAttribute("data-scraper-expanded", "1");
+    try {
+        button.click();
+        expanded += 1;
+    } catch (e) {}
+}
+return expanded;
+"""
+
+
+def expand_see_more_buttons(driver, scrollable_div=None) -> int:
+    """Expands every unexpanded review in a single injected script call.
+
+    Args:
+        driver: WebDriver on the reviews panel
+        scrollable_div: Reviews container to search (default: whole document)
+
+    Returns:
+        int: Number of "See more" buttons clicked by this call
+    """
+    return driver.execute_script(EXPAND_SEE_MORE_JS, scrollable_div)
+
+
+@dataclass
+class ScrollStats:
+    """Time split and counters for one pass of expand_all_reviews()."""
+
+    iterations: int = 0
+    waiting: float = 0.0
+    working: float = 0.0
+    reviews_loaded: int = 0
+    buttons_clicked: int = 0
+    spinner_waits: int = 0
+    reached_end: bool = False  # False when max_attempts cut the scroll short
+
+    def report(self) -> str:
+        total = self.waiting + self.working
+        share = self.waiting / total * 100 if total else 0.0
+        return (
+            f"{self.reviews_loaded} reviews in {self.iterations} scrolls: "
+            f"{self.waiting:.1f}s waiting ({share:.0f}%), {self.working:.1f}s working"
+        )
+
+
+class ScrollEngine:
+    """Scrolls the reviews panel and waits on DOM signals instead of fixed sleeps.
+
+    Each wait resolves through a MutationObserver promise as soon as new review
+    cards are attached and the loading spinner is gone, bounded by min_wait
+    (lets a batch settle) and max_wait (gives up when nothing loads).
+    """
+
+    def __init__(
+        self, driver, scrollable_div, min_wait: float = 0.2, max_wait: float = 5.0
+    ):
+        if min_wait > max_wait:
+            raise ValueError("min_wait must not be greater than max_wait")
+        self.driver = driver
+        self.scrollable_div = scrollable_div
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.stats = ScrollStats()
+        # execute_async_script must outlive the longest wait we ask for
+        driver.set_script_timeout(max_wait + 5)
+
+    @contextmanager
+    def working(self):
+        """Counts the enclosed block as work time."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stats.working += time.perf_counter() - start
+
+    def review_count(self) -> int:
+        with self.working():
+            return self.driver.execute_script(
+                'return arguments[0].querySelectorAll("div.jftiEf").length',
+                self.scrollable_div,
+            )
+
+    def scroll(self) -> None:
+        with self.working():
+            self.driver.execute_script(
+                "arguments[0].scrollTop = arguments[0].scrollHeight",
+                self.scrollable_div,
+            )
+        self.stats.iterations += 1
+
+    def wait_for_reviews(self, previous_count: int) -> dict:
+        """Blocks until more than previous_count reviews are loaded or max_wait passes.
+
+        Returns:
+            dict with the current review "count", whether the spinner is still
+            "loading" and the "reason" the wait ended ("grew" or "timeout")
+        """
+        start = time.perf_counter()
+        try:
+            return self.driver.execute_async_script(
+                WAIT_FOR_REVIEWS_JS,
+                self.scrollable_div,
+                previous_count,
+                self.min_wait,
+                self.max_wait,
+            )
+        finally:
+            self.stats.waiting += time.perf_counter() - start
+
+
+def review_fingerprint(author: str, content: str) -> str:
+    """Hashes a review by author first/last name and its word characters.
+
+    Punctuation, whitespace and emojis are ignored so a freshly scraped review
+    matches the cleaned copy stored by import_reviews.
+    """
+    parts = (author or "").lower().split()
+    name = f"{parts[0]} {parts[-1]}" if len(parts) >= 2 else "".join(parts)
+    text = re.sub(r"\W+", "", (content or "").lower())
+    return hashlib.sha1(f"{name}|{text}".encode("utf-8")).hexdigest()
+
+
+def _review_day(value) -> Optional[date]:
+    """Turns an absolute or relative review date into a date, or None."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(
+            parse_relative_date(str(value))[:10], "%Y-%m-%d"
+        ).date()
+    except ValueError:
+        return None
+
+
+@dataclass
+class ReviewWatermark:
+    """High-water mark of the reviews already stored for one store.
+
+    A scraped review is "known" when its fingerprint was already stored, or
+    when it is older than the latest stored review by more than
+    tolerance_days (relative dates like "a month ago" are approximate).
+    """
+
+    latest_date: Optional[date] = None
+    fingerprints: set = field(default_factory=set)
+    tolerance_days: int = 31
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], **kwargs) -> "ReviewWatermark":
+        """Builds a watermark from stored rows with first_name, last_name,
+        review and review_date keys (see ScrapeEvent.objects.review_watermark())."""
+        watermark = cls(**kwargs)
+        for record in records:
+            author = f"{record.get('first_name') or ''} {record.get('last_name') or ''}"
+            watermark.fingerprints.add(review_fingerprint(author, record.get("review")))
+            day = _review_day(record.get("review_date"))
+            if day and (watermark.latest_date is None or day > watermark.latest_date):
+                watermark.latest_date = day
+        return watermark
+
+    def is_known(self, review: dict) -> bool:
+        if (
+            review_fingerprint(review.get("author"), review.get("content"))
+            in self.fingerprints
+        ):
+            return True
+        day = _review_day(review.get("date"))
+        return bool(
+            day
+            and self.latest_date
+            and day < self.latest_date - timedelta(days=self.tolerance_days)
+        )
+
+
+def sort_reviews_newest(driver) -> None:
+    """Switches the open reviews panel to newest-first order."""
+    first_review = driver.find_element(By.CSS_SELECTOR, "div.jftiEf")
+    WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable(
+            (By.CSS_SELECTOR, 'button[aria-label="Sort reviews"]')
+        )
+    ).click()
+    WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable(
+            (By.CSS_SELECTOR, 'div[role="menuitemradio"][data-index="1"]')
+        )
+    ).click()
+    # The panel re-renders its cards once the new order arrives
+    WebDriverWait(driver, 10).until(EC.staleness_of(first_review))
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "div.jftiEf"))
+    )
+    print("Reviews sorted newest first")
+
+
+def expand_all_reviews(
+    driver,
+    url: str,
+    expected_url: str,
+    max_attempts=30,
+    min_wait: float = 0.2,
+    max_wait: float = 5.0,
+    watermark: Optional[ReviewWatermark] = None,
+) -> ScrollStats:
     """Automatically scrolls through and expands all Google Maps reviews.
 
     Continuously scrolls to the bottom of the reviews container, clicking all
@@ -114,6 +379,14 @@ def expand_all_reviews(driver, url: str, expected_url: str, max_attempts=30):
     Args:
         driver (webdriver): Selenium WebDriver instance
         max_attempts (int): Maximum scroll attempts before stopping (default: 30)
+        min_wait (float): Minimum seconds to let a batch of reviews settle
+        max_wait (float): Seconds to wait for new reviews before a scroll
+            counts as empty
+        watermark (ReviewWatermark): Incremental mode; sorts newest first and
+            stops scrolling at the first review already stored for the store
+
+    Returns:
+        ScrollStats: Scroll iterations and time spent waiting versus working
 
     Raises:
         TimeoutException: If critical elements aren't found within wait time
@@ -122,11 +395,181 @@ def expand_all_reviews(driver, url: str, expected_url: str, max_attempts=30):
     Notes:
         - Requires being on a Google Maps location page with reviews loaded
         - Designed to work with Google Maps' dynamic review loading system
-        - Includes automatic loading spinner detection
+        - Waits on the review count and loading spinner via ScrollEngine
     """
 
     verify_url(driver, url, expected_url)
+    return _expand_loaded_reviews(driver, max_attempts, min_wait, max_wait, watermark)
+
+
+@timed_phase("expand_all_reviews")
+def _expand_loaded_reviews(
+    driver,
+    max_attempts=30,
+    min_wait: float = 0.2,
+    max_wait: float = 5.0,
+    watermark: Optional[ReviewWatermark] = None,
+) -> ScrollStats:
+    """expand_all_reviews() on the place already loaded in the driver."""
+    scrollable_div = _open_reviews_panel(driver)
+    engine = ScrollEngine(driver, scrollable_div, min_wait=min_wait, max_wait=max_wait)
+    if watermark is not None:
+        with engine.working():
+            sort_reviews_newest(driver)
+
+    reviews_checked = 0
+    for review_count in _scroll_reviews(engine, max_attempts):
+        # Incremental mode: stop once the newest-first list reaches stored reviews
+        if watermark is not None and review_count > reviews_checked:
+            with engine.working():
+                # Fingerprints cover the full text, so expand before extracting;
+                # the first count arrives before any scroll pass has expanded
+                engine.stats.buttons_clicked += expand_see_more_buttons(
+                    driver, scrollable_div
+                )
+                loaded = driver.execute_script(EXTRACT_REVIEWS_JS, reviews_checked)
+            reviews_checked += len(loaded)
+            if any(watermark.is_known(review) for review in loaded):
+                print("Reached reviews already stored - ending scroll")
+                break
+
+    _report_scroll(engine)
+    snap_to_top_of_page(driver)
+    return engine.stats
+
+
+def iter_reviews(
+    driver,
+    url: str,
+    expected_url: str,
+    max_attempts=30,
+    min_wait: float = 0.2,
+    max_wait: float = 5.0,
+    watermark: Optional[ReviewWatermark] = None,
+    checkpoint: Optional[ScrapeCheckpoint] = None,
+) -> Iterator[dict]:
+    """Streams reviews while scrolling instead of after expand_all_reviews().
+
+    Every time the scroll engine sees new review cards, their "See more"
+    buttons are expanded and the new cards are extracted in one script call
+    and yielded straight away, so memory and time to first row stay flat.
 
+    Args:
+        Same as expand_all_reviews(), plus
+        checkpoint (ScrapeCheckpoint): Saves progress at intervals; when it
+            holds an earlier interrupted run, its reviews are yielded first
+            and the panel is fast-forwarded past them instead of re-extracted
+
+    Yields:
+        dict: Review records in the get_reviews() shape, dates resolved
+
+    Example:
+        save_to_csv(address, iter_reviews(driver, url, expected_url), ...)
+    """
+    verify_url(driver, url, expected_url)
+    yield from _iter_loaded_reviews(
+        driver, max_attempts, min_wait, max_wait, watermark, checkpoint
+    )
+
+
+@timed_phase("iter_reviews")
+def _iter_loaded_reviews(
+    driver,
+    max_attempts=30,
+    min_wait: float = 0.2,
+    max_wait: float = 5.0,
+    watermark: Optional[ReviewWatermark] = None,
+    checkpoint: Optional[ScrapeCheckpoint] = None,
+) -> Iterator[dict]:
+    """iter_reviews() on the place already loaded in the driver."""
+    scrollable_div = _open_reviews_panel(driver)
+    engine = ScrollEngine(driver, scrollable_div, min_wait=min_wait, max_wait=max_wait)
+    if watermark is not None:
+        with engine.working():
+            sort_reviews_newest(driver)
+
+    anchor = datetime.now()  # One scrape timestamp for every batch
+    emitted = 0
+    resumed_at, seen = 0, set()
+    if checkpoint is not None:
+        checkpoint.start(anchor)
+        anchor = checkpoint.scraped_at
+        if checkpoint.resumable:
+            resumed_at = checkpoint.position
+            print(f"Resuming from checkpoint at review {resumed_at}")
+            yield from checkpoint.saved_reviews()
+            seen = {
+                review_fingerprint(review.get("author"), review.get("content"))
+                for review in checkpoint.tail
+            }
+            _fast_forward(engine, resumed_at, max_attempts)
+            emitted = max(0, resumed_at - RESUME_OVERLAP)
+
+    finished = False
+    try:
+        for review_count in _scroll_reviews(engine, max_attempts):
+            if review_count <= emitted:
+                continue
+            with engine.working():
+                engine.stats.buttons_clicked += expand_see_more_buttons(
+                    driver, scrollable_div
+                )
+                batch = driver.execute_script(EXTRACT_REVIEWS_JS, emitted)
+            new = []
+            for index, review_data in enumerate(
+                resolve_review_dates(batch, anchor), emitted
+            ):
+                if watermark is not None and watermark.is_known(review_data):
+                    print("Reached reviews already stored - ending scroll")
+                    finished = True
+                    break
+                # Overlap re-read on resume: skip cards the checkpoint already holds
+                if index < resumed_at and (
+                    review_fingerprint(review_data["author"], review_data["content"])
+                    in seen
+                ):
+                    continue
+                new.append(review_data)
+            emitted += len(batch)
+            if checkpoint is not None and batch:
+                last = batch[-1]
+                checkpoint.record(
+                    new, emitted, review_fingerprint(last["author"], last["content"])
+                )
+            count("reviews_extracted", len(new))
+            yield from new
+            if finished:
+                return
+        finished = engine.stats.reached_end
+    finally:
+        _report_scroll(engine)
+        if checkpoint is not None:
+            # Keep progress for the next run unless the panel was read to the end
+            # (or to stored reviews); hitting max_attempts is not the end
+            if finished:
+                checkpoint.clear()
+            else:
+                checkpoint.flush()
+
+
+def _fast_forward(engine: ScrollEngine, target_count: int, max_attempts: int) -> None:
+    """Scrolls until target_count cards are loaded, without expanding or extracting."""
+    review_count = engine.review_count()
+    consecutive_no_loads = 0
+    while review_count < target_count and max_attempts > 0 and consecutive_no_loads < 3:
+        engine.scroll()
+        signal = engine.wait_for_reviews(review_count)
+        if signal["count"] > review_count:
+            review_count = signal["count"]
+            consecutive_no_loads = 0
+        elif not signal["loading"]:
+            consecutive_no_loads += 1
+        max_attempts -= 1
+    print(f"Fast-forwarded to {review_count} reviews")
+
+
+def _open_reviews_panel(driver):
+    """Clicks the Reviews tab and returns the scrollable reviews container."""
     # ==========Click Reviews Button==========
     try:
         overview_button = WebDriverWait(driver, 10).until(
@@ -135,182 +578,412 @@ def expand_all_reviews(driver, url: str, expected_url: str, max_attempts=30):
             )
         )
         overview_button.click()
-        time.sleep(3)
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.jftiEf"))
+        )
         print("Reviews button clicked!")
     except Exception as e:
         print(f"Could not click Reviews button, error: {e}")
 
-    # ==========Scroll Logic==========
+    return driver.find_element(By.CSS_SELECTOR, "div.m6QErb.DxyBCb.kA9KIf.dS8AEf")
+
+
+def _scroll_reviews(engine: ScrollEngine, max_attempts: int) -> Iterator[int]:
+    """Scrolls until nothing new loads, yielding the review count after each pass.
+
+    The first value is the count before any scrolling. Every pass also
+    expands the "See more" buttons on the cards loaded so far. Sets
+    engine.stats.reached_end when it stops because nothing more loads,
+    as opposed to running out of max_attempts.
+    """
+    review_count = engine.review_count()
+    engine.stats.reviews_loaded = review_count
+    yield review_count
 
-    scrollable_div = driver.find_element(
-        By.CSS_SELECTOR, "div.m6QErb.DxyBCb.kA9KIf.dS8AEf"
-    )
-    last_height = driver.execute_script(
-        "return arguments[0].scrollHeight", scrollable_div
-    )
-    loading_circle_selector = 'div[aria-label="Loading..."]'
     consecutive_no_loads = 0
     max_consecutive_no_loads = 3  # Adjust based on network speed
 
     while True:
-        # Scroll to bottom
-        driver.execute_script(
-            "arguments[0].scrollTop = arguments[0].scrollHeight", scrollable_div
-        )
-        time.sleep(2)
+        # Scroll to bottom and wait for the next batch (or the timeout)
+        engine.scroll()
+        signal = engine.wait_for_reviews(review_count)
 
-        # Check for loading indicator
-        try:
-            WebDriverWait(driver, 1).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, loading_circle_selector)
-                )
-            )
-            print("Loading detected, waiting...")
-            time.sleep(3)  # Extra wait for loading to complete
+        if signal["count"] > review_count:
+            review_count = signal["count"]
             consecutive_no_loads = 0
-        except:
+        elif signal["loading"]:
+            engine.stats.spinner_waits += 1
+            print("Loading detected, waiting...")
+        else:
             consecutive_no_loads += 1
             print(
                 f"No loading detected ({consecutive_no_loads}/{max_consecutive_no_loads})"
             )
 
         # Click all "See more" buttons
-        more_buttons = driver.find_elements(
-            By.CSS_SELECTOR, 'button[aria-label^="See more"]'
-        )
+        with engine.working():
+            expanded = expand_see_more_buttons(engine.driver, engine.scrollable_div)
+        engine.stats.buttons_clicked += expanded
+        if expanded:
+            print(f"Expanded review text on {expanded} reviews")
 
-        for btn in more_buttons:
-            try:
-                driver.execute_script(
-                    "arguments[0].scrollIntoView({block: 'center'});", btn
-                )
-                ActionChains(driver).move_to_element(btn).pause(0.5).click().perform()
-                print("Expanded review text")
-                time.sleep(0.3)
-
-            except Exception as e:
-                print(f"Couldn't click button: {str(e)}")
-                continue
+        engine.stats.reviews_loaded = review_count
+        yield review_count
 
         # Check if we've reached the end
-        new_height = driver.execute_script(
-            "return arguments[0].scrollHeight", scrollable_div
-        )
-        if new_height == last_height:
-            if consecutive_no_loads >= max_consecutive_no_loads:
-                print("No new content loaded - ending scroll")
-                break
-        else:
-            last_height = new_height
-            consecutive_no_loads = 0
+        if consecutive_no_loads >= max_consecutive_no_loads:
+            print("No new content loaded - ending scroll")
+            engine.stats.reached_end = True
+            return
 
         # Safety check
         max_attempts -= 1
         if max_attempts <= 0:
             print("Reached maximum scroll attempts")
-            break
+            return
+
 
+def _report_scroll(engine: ScrollEngine) -> None:
     print("Finished scrolling through all available reviews")
-    return snap_to_top_of_page(driver)
+    print(engine.stats.report())
+    inspector_gadget.get_log().info(f"Scroll stats: {engine.stats.report()}")
+    count("scroll_iterations", engine.stats.iterations)
+    count("scroll_wait_seconds", engine.stats.waiting)
+    count("spinner_waits", engine.stats.spinner_waits)
+    count("buttons_clicked", engine.stats.buttons_clicked)
+
+
+# Prefer the C-backed lxml parser for whole-page parses when it is installed
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Collects every loaded review card in a single round trip. Mirrors the
+# BeautifulSoup selectors in _review_from_soup() so both paths return the same dict.
+EXTRACT_REVIEWS_JS = """
+const start = arguments[0] || 0;
+const stripped = (el) => {
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    let text = "";
+    while (walker.nextNode()) { text += walker.currentNode.nodeValue.trim(); }
+    return text;
+};
+const cards = Array.from(document.querySelectorAll("div.jftiEf")).slice(start);
+return cards.map((card) => {
+    const author = card.querySelector("div.d4r55");
+    const date = card.querySelector("span.rsqaWe");
+    const content = card.querySelector("span.wiI7pd");
+    return {
+        author: author ? author.textContent : null,
+        overall_stars: card.querySelectorAll(
+            'span[aria-hidden="true"].hCCjke.elGi1d'
+        ).length,
+        date: date ? date.textContent : null,
+        content: content ? content.textContent : null,
+        category_ratings: Array.from(card.querySelectorAll("div.PBK6be"))
+            .map(stripped)
+            .filter((text) => text.includes(":")),
+    };
+});
+"""
+
+
+@timed_phase("get_reviews")
+def get_reviews(
+    driver,
+    mode: str = "per_review",
+    watermark: Optional[ReviewWatermark] = None,
+    anchor: Optional[datetime] = None,
+    archive: Optional[SnapshotArchive] = None,
+) -> List[dict]:
+    """Extracts every loaded review from the open reviews panel.
 
+    Args:
+        driver: WebDriver already on an expanded reviews panel
+        mode: "per_review" scrolls to and parses each review one at a time,
+            "script" collects all reviews in one injected script call and
+            "page_source" parses the whole page once with HTML_PARSER
+        watermark: Incremental mode; drops the first review already stored
+            and everything after it (the panel is sorted newest first)
+        anchor: Scrape timestamp the relative dates resolve against (default: now)
+        archive: Also store the raw page HTML there, keyed by place and anchor,
+            so it can be re-parsed later without the browser
 
-def get_reviews(driver) -> List[dict]:
+    Returns:
+        List of review dicts with author, overall_stars, date, content and
+        category_ratings keys, plus date_relative and scraped_at
+    """
+    if mode not in ("per_review", "script", "page_source"):
+        raise ValueError(f"Unknown get_reviews() mode: {mode}")
+    anchor = anchor or datetime.now()
+    page_html = None
 
     # Snap back to top
     scrollable_div = driver.find_element(
         By.CSS_SELECTOR, "div.m6QErb.DxyBCb.kA9KIf.dS8AEf"
     )
     driver.execute_script("arguments[0].scrollTop = 0", scrollable_div)
-    time.sleep(2)  # Allow UI to settle
 
-    # Get all review elements
-    reviews = WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.jftiEf"))
-    )
-    print(f"Found {len(reviews)} reviews")
-
-    # Extract data from each review
-    all_reviews_data = []
-    for review in reviews:
-
-        # Scroll each review into view to ensure full rendering
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", review)
-        time.sleep(0.3)
-
-        # Parse
-        soup = BeautifulSoup(review.get_attribute("outerHTML"), "html.parser")
-
-        review_data = {
-            "author": (
-                soup.select_one("div.d4r55").text
-                if soup.select_one("div.d4r55")
-                else None
-            ),
-            "overall_stars": len(
-                soup.select('span[aria-hidden="true"].hCCjke.elGi1d')
-            ),  # Count filled stars
-            "date": (
-                parse_relative_date(soup.select_one("span.rsqaWe").text)
-                if soup.select_one("span.rsqaWe")
-                else None
-            ),
-            "content": (
-                soup.select_one("span.wiI7pd").text
-                if soup.select_one("span.wiI7pd")
-                else None
-            ),
-            "category_ratings": [],
-        }
+    if mode == "script":
+        all_reviews_data = driver.execute_script(EXTRACT_REVIEWS_JS, 0)
+        resolve_review_dates(all_reviews_data, anchor)
+        print(f"Found {len(all_reviews_data)} reviews")
+    elif mode == "page_source":
+        page_html = driver.page_source
+        all_reviews_data = parse_reviews_html(page_html, anchor)
+        print(f"Found {len(all_reviews_data)} reviews")
+    else:
+        time.sleep(2)  # Allow UI to settle
+
+        # Get all review elements
+        reviews = WebDriverWait(driver, 10).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.jftiEf"))
+        )
+        print(f"Found {len(reviews)} reviews")
 
-        # Extract category ratings if they exist
-        rating_divs = soup.select("div.PBK6be")
-        for div in rating_divs:
-            rating_text = div.get_text(strip=True)
-            if ":" in rating_text:  # Basic validation for category:rating format
-                review_data["category_ratings"].append(rating_text)
-        all_reviews_data.append(review_data)
+        # Extract data from each review
+        all_reviews_data = []
+        for review in reviews:
+
+            # Scroll each review into view to ensure full rendering
+            driver.execute_script(
+                "arguments[0].scrollIntoView({block: 'center'});", review
+            )
+            time.sleep(0.3)
 
+            # Parse
+            soup = BeautifulSoup(review.get_attribute("outerHTML"), "html.parser")
+            all_reviews_data.append(_review_from_soup(soup))
+        resolve_review_dates(all_reviews_data, anchor)
+
+    if archive is not None:
+        url = driver.current_url
+        archive.put(page_html or driver.page_source, place_key(url), anchor, url)
+
+    if watermark is not None:
+        for i, review_data in enumerate(all_reviews_data):
+            if watermark.is_known(review_data):
+                all_reviews_data = all_reviews_data[:i]
+                break
+        print(f"{len(all_reviews_data)} reviews are new since the last scrape")
+
+    count("reviews_extracted", len(all_reviews_data))
     return all_reviews_data
 
 
-def parse_relative_date(relative_date: str) -> str:
+def parse_reviews_html(page_html: str, anchor: Optional[datetime] = None) -> List[dict]:
+    """Extracts every review card from a saved or live page in one parse.
+
+    Args:
+        page_html: Full page HTML, e.g. driver.page_source or a saved fixture
+        anchor: When the page was captured; relative dates resolve against it
+
+    Returns:
+        List of review dicts in the same shape as get_reviews()
+    """
+    soup = BeautifulSoup(page_html, HTML_PARSER)
+    return resolve_review_dates(
+        [_review_from_soup(review) for review in soup.select("div.jftiEf")], anchor
+    )
+
+
+def _review_from_soup(soup) -> dict:
+    """Builds the review dict from one parsed div.jftiEf review card."""
+    review_data = {
+        "author": (
+            soup.select_one("div.d4r55").text if soup.select_one("div.d4r55") else None
+        ),
+        "overall_stars": len(
+            soup.select('span[aria-hidden="true"].hCCjke.elGi1d')
+        ),  # Count filled stars
+        "date": (
+            soup.select_one("span.rsqaWe").text
+            if soup.select_one("span.rsqaWe")
+            else None
+        ),  # Relative; resolved per batch by resolve_review_dates()
+        "content": (
+            soup.select_one("span.wiI7pd").text
+            if soup.select_one("span.wiI7pd")
+            else None
+        ),
+        "category_ratings": [],
+    }
+
+    # Extract category ratings if they exist
+    rating_divs = soup.select("div.PBK6be")
+    for div in rating_divs:
+        rating_text = div.get_text(strip=True)
+        if ":" in rating_text:  # Basic validation for category:rating format
+            review_data["category_ratings"].append(rating_text)
+    return review_data
+
+
+_PLACE_ID = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)", re.IGNORECASE)
+
+
+def same_place(current_url: str, target_url: str) -> bool:
+    """True when both URLs point at the same place.
+
+    Maps rewrites the URL after load (zoom, tab, tracking params) but keeps
+    the !1s<feature id> of the place, so that is compared when present.
+    """
+    return place_key(current_url) == place_key(target_url)
+
+
+def place_key(url: str) -> str:
+    """Stable key of a place URL: its Maps feature id, else the bare URL."""
+    match = _PLACE_ID.search(url)
+    return match.group(1).lower() if match else url.split("#")[0].rstrip("/")
+
+
+class PlaceSession:
+    """One loaded place page shared by address lookup, expansion and extraction.
+
+    get_address(), expand_all_reviews() and iter_reviews() each load and
+    verify the URL again; a PlaceSession loads it once and runs every step
+    on the page that is already there. Navigation is skipped entirely when
+    the driver is already on the target place.
+
+    Example:
+        with webdriver.Chrome() as driver:
+            place = PlaceSession(driver, url, "google.com/maps/place/Starbucks")
+            address = place.get_address()
+            place.expand_all_reviews()
+            data = place.get_reviews(mode="script")
+    """
+
+    def __init__(self, driver, url: str, expected_url: str):
+        self.driver = driver
+        self.url = url
+        self.expected_url = expected_url
+        self.page_loads = 0
+
+    def open(self) -> "PlaceSession":
+        """Loads and verifies the place unless the driver is already on it."""
+        if same_place(self.driver.current_url, self.url):
+            _check_url(self.driver.current_url, self.expected_url)
+        else:
+            verify_url(self.driver, self.url, self.expected_url)
+            self.page_loads += 1
+        return self
+
+    def get_address(self) -> str:
+        self.open()
+        return _read_address(self.driver)
+
+    def expand_all_reviews(self, **kwargs) -> ScrollStats:
+        """See expand_all_reviews() for the keyword arguments."""
+        self.open()
+        return _expand_loaded_reviews(self.driver, **kwargs)
+
+    def iter_reviews(self, **kwargs) -> Iterator[dict]:
+        """See iter_reviews() for the keyword arguments."""
+        self.open()
+        yield from _iter_loaded_reviews(self.driver, **kwargs)
+
+    def get_reviews(self, **kwargs) -> List[dict]:
+        """See get_reviews() for the keyword arguments."""
+        self.open()
+        return get_reviews(self.driver, **kwargs)
+
+
+def parse_relative_date(relative_date: str, anchor: Optional[datetime] = None) -> str:
     """Convert Google Maps relative dates to YYYY-MM-DD format.
 
     Args:
         relative_date: String like "3 months ago", "a year ago", etc.
+        anchor: Moment the date is relative to, normally the scrape time
+            (default: now)
 
     Returns:
         Date string in YYYY-MM-DD format (or original string if conversion fails)
     """
-    today = datetime.now()
+    delta = _relative_delta(relative_date)
+    if delta is None:
+        return relative_date  # Return original if pattern doesn't match
 
+    actual_date = (anchor or datetime.now()) - delta
+    return actual_date.strftime("%Y-%m-%d")
+
+
+@functools.lru_cache(maxsize=4096)
+def _relative_delta(relative_date: str) -> Optional[timedelta]:
+    """Parses "3 weeks ago" into a timedelta once per distinct string."""
     try:
         # Handle "a month ago" -> "1 month ago"
         normalized = relative_date.lower().replace("a ", "1 ")
 
         # Extract number and unit
-        match = re.search(r"(\d+)\s+(year|month|day|week)s?", normalized)
+        match = _RELATIVE_DATE.search(normalized)
         if not match:
-            return relative_date  # Return original if pattern doesn't match
+            return None
 
         num, unit = int(match.group(1)), match.group(2)
 
         # Calculate timedelta
         if unit == "day":
-            delta = timedelta(days=num)
+            return timedelta(days=num)
         elif unit == "week":
-            delta = timedelta(weeks=num)
+            return timedelta(weeks=num)
         elif unit == "month":
-            delta = timedelta(days=num * 30)  # Approximate
+            return timedelta(days=num * 30)  # Approximate
         elif unit == "year":
-            delta = timedelta(days=num * 365)  # Approximate
-
-        actual_date = today - delta
-        return actual_date.strftime("%Y-%m-%d")
+            return timedelta(days=num * 365)  # Approximate
 
     except Exception:
-        return relative_date  # Fallback to original string
+        return None  # Fallback to original string
+
+
+_RELATIVE_DATE = re.compile(r"(\d+)\s+(year|month|day|week)s?")
+
+
+def resolve_relative_dates(values, anchor: Optional[datetime] = None):
+    """Resolves a whole column of relative dates against one anchor.
+
+    Only the distinct strings are parsed (a location's reviews share a few
+    dozen values such as "3 weeks ago"), then mapped back onto every row.
+
+    Args:
+        values: List of relative date strings, or a pandas Series
+        anchor: Scrape timestamp every value is relative to (default: now)
+
+    Returns:
+        Same container type as values (list or Series) with YYYY-MM-DD strings;
+        None/NaN and unparseable values are passed through
+    """
+    anchor = anchor or datetime.now()
+    if hasattr(values, "unique") and hasattr(values, "map"):
+        distinct = values.unique()
+        mapping = {
+            v: parse_relative_date(v, anchor) for v in distinct if isinstance(v, str)
+        }
+        return values.map(mapping).where(values.isin(list(mapping)), values)
+    mapping = {}
+    for value in values:
+        if isinstance(value, str) and value not in mapping:
+            mapping[value] = parse_relative_date(value, anchor)
+    return [
+        mapping.get(value, value) if isinstance(value, str) else value
+        for value in values
+    ]
+
+
+def resolve_review_dates(
+    reviews: List[dict], anchor: Optional[datetime] = None
+) -> List[dict]:
+    """Resolves the relative "date" of a batch of review dicts in place.
+
+    The raw string is kept in "date_relative" and the anchor in "scraped_at"
+    (ISO format) so the absolute date can be recomputed later.
+    """
+    anchor = anchor or datetime.now()
+    scraped_at = anchor.isoformat(timespec="seconds")
+    relative = [review.get("date") for review in reviews]
+    for review, raw, resolved in zip(
+        reviews, relative, resolve_relative_dates(relative, anchor)
+    ):
+        review["date_relative"] = raw
+        review["date"] = resolved
+        review["scraped_at"] = scraped_at
+    return reviews
 
 
 def parse_data_to_list(
@@ -369,6 +1042,138 @@ def parse_data_to_list(
     return list_holding_parsed_data_1, list_holding_parsed_data_2
 
 
+# ==========Archived HTML dumps==========
+# One compiled pattern visits every class attribute in the document once;
+# parse_review_dump() dispatches on the Maps class names it finds.
+_CLASS_ATTR = re.compile(r'class="([^"]*)"[^>]*>')
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _text(fragment: str) -> str:
+    """Text of an HTML fragment, like BeautifulSoup's .text."""
+    return html.unescape(_TAG.sub("", fragment))
+
+
+def _stripped_text(fragment: str) -> str:
+    """Text of an HTML fragment, like BeautifulSoup's get_text(strip=True)."""
+    return "".join(html.unescape(piece).strip() for piece in _TAG.split(fragment))
+
+
+def parse_review_dump(page_html: str, anchor: Optional[datetime] = None) -> List[dict]:
+    """Extracts full review records from a saved review-panel HTML dump.
+
+    Replaces parse_data_to_list() for archived pages. The document is walked
+    once and every field is attached to the div.jftiEf card it appears in,
+    so a review without stars or text yields 0/None for that review instead
+    of borrowing the next review's value.
+
+    Args:
+        page_html: Saved page, e.g. driver.page_source written to disk
+        anchor: When the page was captured; relative dates resolve against it
+
+    Returns:
+        List of review dicts in the same shape as get_reviews()
+    """
+    reviews = []
+    review = None
+    for match in _CLASS_ATTR.finditer(page_html):
+        classes = match.group(1)
+        if "jftiEf" in classes:
+            review = {
+                "author": None,
+                "overall_stars": 0,
+                "date": None,
+                "content": None,
+                "category_ratings": [],
+            }
+            reviews.append(review)
+        elif review is None:
+            continue
+        elif "hCCjke" in classes:
+            if "elGi1d" in classes.split():  # Count filled stars
+                review["overall_stars"] += 1
+        elif "d4r55" in classes:
+            end = page_html.find("</div>", match.end())
+            review["author"] = _text(page_html[match.end() : end])
+        elif "rsqaWe" in classes:
+            end = page_html.find("</span>", match.end())
+            review["date"] = _text(page_html[match.end() : end])
+        elif "wiI7pd" in classes:
+            end = page_html.find("</span>", match.end())
+            review["content"] = _text(page_html[match.end() : end])
+        elif "PBK6be" in classes:
+            end = page_html.find("</div>", match.end())
+            rating_text = _stripped_text(page_html[match.end() : end])
+            if ":" in rating_text:  # Basic validation for category:rating format
+                review["category_ratings"].append(rating_text)
+    return resolve_review_dates(reviews, anchor)
+
+
+_ADDRESS_LABEL = re.compile(r'aria-label="Address:\s*([^"]+)"')
+
+
+def parse_page_address(page_html: str) -> Optional[str]:
+    """Reads the place address from a saved page, like get_address() does live."""
+    match = _ADDRESS_LABEL.search(page_html)
+    return html.unescape(match.group(1)).strip() if match else None
+
+
+def _parse_dump_file(path: str) -> Tuple[str, List[dict], int]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        page_html = f.read()
+    return path, parse_review_dump(page_html), len(page_html.encode("utf-8"))
+
+
+def parse_review_dumps(
+    directory: str, pattern: str = "*.html*", workers: Optional[int] = None
+) -> Iterator[Tuple[str, List[dict]]]:
+    """Parses every archived page in a directory across worker processes.
+
+    Args:
+        directory: Folder of saved review-panel pages (.html or .html.gz)
+        pattern: Glob for the files to parse
+        workers: Process count (default: os.cpu_count())
+
+    Yields:
+        (path, reviews) per file, in sorted path order
+    """
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, reviews, _ in executor.map(_parse_dump_file, paths):
+            yield path, reviews
+
+
+def _parse_snapshot(
+    root: str, record: SnapshotRecord
+) -> Tuple[SnapshotRecord, List[dict]]:
+    page_html = SnapshotArchive(root).read(record.sha256)
+    return record, parse_review_dump(
+        page_html, datetime.fromisoformat(record.scraped_at)
+    )
+
+
+def reparse_snapshots(
+    archive: SnapshotArchive, workers: Optional[int] = None, **filters
+) -> Iterator[Tuple[SnapshotRecord, List[dict]]]:
+    """Re-runs extraction over archived snapshots across worker processes.
+
+    Each snapshot's relative dates resolve against its own scrape time, so
+    the output matches what get_reviews() returned on the day.
+
+    Args:
+        archive: SnapshotArchive written by get_reviews(archive=...)
+        workers: Process count (default: os.cpu_count())
+        **filters: place / since / until, see SnapshotArchive.records()
+
+    Yields:
+        (record, reviews) per index entry, in index order
+    """
+    records = list(archive.records(**filters))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_parse_snapshot, [archive.root] * len(records), records)
+
+
 def main():
     pass
 
@@ -1,11 +1,17 @@
 import csv
+import gzip
+import io
 import os
 import sys
-from typing import List
+import uuid
+from datetime import datetime
+from typing import Iterable
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.browser_profile import get_profile
 from b_utils.helper import get_directory_name
 from b_utils.logger import Logger
+from b_utils.storage import is_parquet
 from a_sourceCode.i_web_scraper import *
 
 abs_path = get_directory_name(
@@ -13,25 +19,48 @@ abs_path = get_directory_name(
 )
 inspector_gadget = Logger(abs_path)
 
-import csv
-from datetime import datetime
-import os
+# Column order of every staged raw CSV
+FIELDNAMES = [
+    "business_address",
+    "review_author",
+    "review_date",
+    "review_rating",
+    "review_content",
+    "category_ratings",
+    "review_date_relative",
+    "scraped_at",
+]
+
+# Output compression, by name and by the file extension that selects it
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
 
 
 def save_to_csv(
     business_address: str,
-    reviews_data: list[dict],
+    reviews_data: Iterable[dict],
     file_path: str = None,
     filename: str = None,
+    chunk_size: int = 1000,
+    compression: str = None,
 ) -> str:
     """
-    Saves scraped Google Maps data to CSV with one row per review.
+    Saves scraped Google Maps data to CSV (or Parquet) with one row per review.
+
+    Rows are buffered chunk_size at a time and written to a temporary file
+    beside the target, which is renamed into place only once every row is
+    written, so readers never see a half-written file and memory stays flat
+    for any number of reviews.
 
     Args:
         business_address: String from get_address() (e.g., "123 Main St")
-        reviews_data: List of review dictionaries from get_reviews()
+        reviews_data: Review dictionaries from get_reviews(), or the iter_reviews()
+            generator to write rows as they are scraped
         file_path: Full path to directory where file should be saved
         filename: Custom filename (optional, will auto-generate if None)
+        chunk_size: Rows buffered between writes to disk
+        compression: "gzip" or "zstd" (zstd needs the zstandard package);
+            by default inferred from a .gz / .zst filename. A .parquet filename
+            writes typed Parquet instead, one row group per chunk
 
     Returns:
         str: Full path to the created CSV file
@@ -42,6 +71,16 @@ def save_to_csv(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"google_maps_{timestamp}.csv"
 
+    parquet = is_parquet(filename)
+    compression = None if parquet else compression or _compression_from_name(filename)
+    if compression is not None:
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(
+                f"Unknown compression {compression}; choose from {sorted(COMPRESSION_EXTENSIONS)}"
+            )
+        if not filename.endswith(COMPRESSION_EXTENSIONS[compression]):
+            filename += COMPRESSION_EXTENSIONS[compression]
+
     # Handle file path
     if file_path:
         os.makedirs(file_path, exist_ok=True)
@@ -51,51 +90,136 @@ def save_to_csv(
         full_path = os.path.join("scraped_data", filename)
 
     # CSV writing
-    fieldnames = [
-        "business_address",
-        "review_author",
-        "review_date",
-        "review_rating",
-        "review_content",
-        "category_ratings",
-    ]
-
-    with open(full_path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for review in reviews_data:
-            writer.writerow(
-                {
-                    "business_address": business_address,
-                    "review_author": review.get("author", ""),
-                    "review_date": parse_relative_date(review.get("date", "")),
-                    "review_rating": review.get("overall_stars", ""),
-                    "review_content": review.get("content", ""),
-                    "category_ratings": " | ".join(review.get("category_ratings", [])),
-                }
+    tmp_path = os.path.join(
+        os.path.dirname(full_path), f".{filename}.{uuid.uuid4().hex}.tmp"
+    )
+    try:
+        if parquet:
+            row_count = _write_parquet(
+                business_address, reviews_data, tmp_path, chunk_size
             )
-
-    print(f"Saved {len(reviews_data)} reviews to {full_path}")
+            os.replace(tmp_path, full_path)
+            print(f"Saved {row_count} reviews to {full_path}")
+            return full_path
+
+        with _open_for_writing(tmp_path, compression) as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
+            writer.writeheader()
+
+            row_count = 0
+            chunk = []
+            for review in reviews_data:
+                chunk.append(_review_row(business_address, review))
+                if len(chunk) >= chunk_size:
+                    writer.writerows(chunk)
+                    row_count += len(chunk)
+                    chunk = []
+            writer.writerows(chunk)
+            row_count += len(chunk)
+        os.replace(tmp_path, full_path)  # Atomic publish
+    except BaseException:
+        # The writer may have failed before creating it (e.g. zstandard missing)
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    print(f"Saved {row_count} reviews to {full_path}")
     return full_path
 
 
-def main():
-    # from selenium.webdriver.chrome.options import Options
-
-    # options = Options()
-    # options.add_argument("--headless")
-    # options.add_argument("--no-sandbox")
-    # options.add_argument("--disable-dev-shm-usage")
+def _review_row(business_address: str, review: dict) -> dict:
+    return {
+        "business_address": business_address,
+        "review_author": review.get("author", ""),
+        # Scraper output is already resolved against its scrape time
+        "review_date": (
+            review.get("date", "")
+            if "date_relative" in review
+            else parse_relative_date(review.get("date", ""))
+        ),
+        "review_rating": review.get("overall_stars", ""),
+        "review_content": review.get("content", ""),
+        "category_ratings": " | ".join(review.get("category_ratings", [])),
+        "review_date_relative": review.get("date_relative", ""),
+        "scraped_at": review.get("scraped_at", ""),
+    }
+
+
+def _write_parquet(
+    business_address: str, reviews_data: Iterable[dict], path: str, chunk_size: int
+) -> int:
+    """Streams review rows into a Parquet file chunk by chunk; returns the row count."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            # Same value on every row: stored once in the dictionary page
+            ("business_address", pa.dictionary(pa.int32(), pa.string())),
+            ("review_author", pa.string()),
+            ("review_date", pa.string()),
+            ("review_rating", pa.int8()),
+            ("review_content", pa.string()),
+            ("category_ratings", pa.string()),
+            ("review_date_relative", pa.string()),
+            ("scraped_at", pa.string()),
+        ]
+    )
+    row_count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        chunk = []
+        for review in reviews_data:
+            row = _review_row(business_address, review)
+            row["review_rating"] = (
+                row["review_rating"] if row["review_rating"] != "" else None
+            )
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                row_count += len(chunk)
+                chunk = []
+        if chunk or not row_count:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            row_count += len(chunk)
+    return row_count
+
+
+def _compression_from_name(filename: str):
+    for compression, extension in COMPRESSION_EXTENSIONS.items():
+        if filename.endswith(extension):
+            return compression
+    return None
+
+
+def _open_for_writing(path: str, compression: str = None):
+    """Opens a text stream for csv.writer, compressing it when asked."""
+    if compression == "gzip":
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("zstd compression requires: pip install zstandard") from e
+        raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(raw, newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def main(profile: str = "default"):
+    # Browser profiles (headless, no_images, small_viewport, lightweight ...)
+    # live in b_utils/browser_profile.py
 
     # Usage (CONTEXT MANAGER)
-    with webdriver.Chrome() as driver:  # Context manager for auto-cleanup
+    with get_profile(
+        profile
+    ).create_driver() as driver:  # Context manager for auto-cleanup
         url = "https://www.google.com/maps/place/Starbucks/@27.1323611,-80.2087961,17z/data=!3m1!4b1!4m6!3m5!1s0x88dedc112a70bb53:0x9413abc42aa43981!8m2!3d27.1323563!4d-80.2062265!16s%2Fg%2F1wt3p70p?entry=ttu&g_ep=EgoyMDI1MDYyMi4wIKXMDSoASAFQAw%3D%3D"
         expected_url = "google.com/maps/place/Starbucks"
-        verify_url(driver, url, expected_url)
-        address = get_address(driver, url, expected_url)
-        expand_all_reviews(driver, url, expected_url)
-        data = get_reviews(driver)
+        # Loads and verifies the place once for every step below
+        place = PlaceSession(driver, url, expected_url)
+        address = place.get_address()
+        # Rows are written while the panel is still scrolling
+        data = place.iter_reviews()
         save_to_csv(
             address,
             data,
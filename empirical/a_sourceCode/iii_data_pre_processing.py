@@ -1,32 +1,47 @@
+import argparse
 import os
 import sys
 import pandas as pd
 import numpy as np
 import re
-
+import importlib.util
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from b_utils.logger import Logger
 from b_utils.helper import get_directory_name
+from b_utils.data_lake import DataLake, add_lake_filters, lake_filters
+from b_utils.storage import TableWriter, is_parquet, iter_table, read_table, write_table
 
 absolute_path = "django_gun/empirical/a_sourceCode"
 inspector_gadget = get_directory_name(absolute_path)
 inspector_gadget = Logger(inspector_gadget)
 
 
-def csv_to_df(abs_path: str) -> pd.DataFrame:
+def csv_to_df(
+    abs_path: str, chunksize: int = None, compact: bool = True
+) -> pd.DataFrame:
+    """Loads a staged CSV (.csv, .csv.gz, .csv.zst) or Parquet file into a DataFrame.
 
-    if not abs_path.lower().endswith("csv"):
+    With chunksize, returns an iterator of DataFrames of at most that many
+    rows instead (see iter_table()). With compact, columns get the
+    compact_dtypes() profile and the memory saved is printed.
+    """
+
+    if not (
+        abs_path.lower().endswith(("csv", "csv.gz", "csv.zst")) or is_parquet(abs_path)
+    ):
         inspector_gadget.get_log().warning(
-            f"csv_to_df() unsuccessful. The file at {absolute_path} is not a .csv file."
+            f"csv_to_df() unsuccessful. The file at {abs_path} is not a .csv or .parquet file."
         )
         return None
 
     try:
-        df = pd.read_csv(abs_path)
+        if chunksize:
+            return iter_table(abs_path, chunksize, compact=compact)
+        df = read_table(abs_path, compact=compact)
         return df
     except Exception as e:
-        inspector_gadget.get_log().error(f"Failed to read CSV file at {abs_path}: {e}")
+        inspector_gadget.get_log().error(f"Failed to read file at {abs_path}: {e}")
         return None
 
 
@@ -60,20 +75,25 @@ def remove_pattern_from_columns(
         return None
 
 
-def remove_emojis(df: pd.DataFrame, *target_cols: str) -> pd.DataFrame:
+def remove_emojis(
+    df: pd.DataFrame, *target_cols: str, inplace: bool = False
+) -> pd.DataFrame:
     """
     Removes ALL Unicode emojis from specified columns in a DataFrame.
 
+    The pattern is compiled once at import (EMOJI_PATTERN) and applied to a
+    whole column at a time, through pyarrow's RE2 kernel when pyarrow is
+    installed and Series.str.replace otherwise. Nulls stay nulls.
+
     Args:
         df: Input DataFrame
         *target_cols: Column names to process (default: all string columns)
+        inplace: Overwrite the columns in df instead of returning a copy
 
     Returns:
-        pd.DataFrame: Copy of DataFrame with emojis removed
+        pd.DataFrame: df itself when inplace, else a copy sharing every
+        untouched column with df
     """
-    # Get all known emoji Unicode codes
-    all_emoji_regex = _get_complete_emoji_regex()
-
     # Default to all string columns if none specified
     cols_to_clean = (
         target_cols
@@ -81,15 +101,27 @@ def remove_emojis(df: pd.DataFrame, *target_cols: str) -> pd.DataFrame:
         else [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
     )
 
-    df_clean = df.copy()
+    # A shallow copy: only the cleaned columns get new data
+    df_clean = df if inplace else df.copy(deep=False)
     for col in cols_to_clean:
-        df_clean[col] = (
-            df_clean[col].astype(str).apply(lambda x: all_emoji_regex.sub("", x))
-        )
+        df_clean[col] = strip_emojis(df_clean[col])
 
     return df_clean
 
 
+def strip_emojis(series: pd.Series) -> pd.Series:
+    """Vectorized EMOJI_PATTERN removal over one column; nulls are kept as they are."""
+    if _HAS_PYARROW:
+        cleaned = series.astype("string[pyarrow]").str.replace(
+            EMOJI_RE2_PATTERN, "", regex=True
+        )
+        if cleaned.dtype != series.dtype:
+            cleaned = cleaned.astype(object)  # Object in, object out
+    else:
+        cleaned = series.astype(str).str.replace(EMOJI_PATTERN, "", regex=True)
+    return cleaned.where(series.notna(), series)
+
+
 def _get_complete_emoji_regex():
     """Builds a regex pattern matching all known emojis"""
     # Base emoji ranges (covers most standard emojis)
@@ -122,6 +154,17 @@ def _get_complete_emoji_regex():
     return re.compile(f"({base_pattern.pattern}|{zwj_pattern.pattern})", re.UNICODE)
 
 
+# Built once; remove_emojis() runs for every file and every chunk
+EMOJI_PATTERN = _get_complete_emoji_regex()
+# Same pattern in RE2 syntax (\x{...} instead of \u/\U escapes) for pyarrow
+EMOJI_RE2_PATTERN = re.sub(
+    r"\\U([0-9A-Fa-f]{8})|\\u([0-9A-Fa-f]{4})",
+    lambda m: "\\x{%X}" % int(m.group(1) or m.group(2), 16),
+    EMOJI_PATTERN.pattern,
+)
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
 def df_to_list_dict_values(df: pd.DataFrame) -> list[dict]:
 
     if not isinstance(
@@ -136,12 +179,89 @@ def df_to_list_dict_values(df: pd.DataFrame) -> list[dict]:
         return df
 
 
+def preprocess_lake(lake_root: str, **filters) -> int:
+    """Cleans only the raw lake partitions the processed layer has not caught up with.
+
+    Args:
+        lake_root: DataLake root directory
+        **filters: business / store / since / until, see DataLake.partitions()
+
+    Returns:
+        int: Number of partitions processed
+    """
+    lake = DataLake(lake_root)
+    pending = lake.pending("raw", "processed", **filters)
+    for entry in pending:
+        df = remove_emojis(lake.read_partition(entry, compact=True), "review_content")
+        lake.write(
+            df,
+            "processed",
+            entry.business,
+            entry.store,
+            entry.scrape_date,
+            source=entry,
+        )
+    inspector_gadget.get_log().info(
+        f"preprocess_lake() processed {len(pending)} partitions"
+    )
+    return len(pending)
+
+
+def preprocess_file(in_path: str, out_path: str, chunksize: int = None) -> str:
+    """Runs stage iii (emoji cleaning) from one staged file into another.
+
+    Args:
+        in_path: Raw CSV or Parquet file
+        out_path: Processed file; a .parquet path writes typed Parquet
+        chunksize: Stream the file chunksize rows at a time so peak memory
+            is bounded by the chunk, not the file. Rows come out in the same
+            order and with the same values as the in-memory path.
+
+    Returns:
+        str: out_path
+    """
+    if not chunksize:
+        df = read_table(in_path, compact=True)
+        return write_table(remove_emojis(df, "review_content"), out_path)
+
+    with TableWriter(out_path) as writer:
+        for chunk in iter_table(in_path, chunksize, compact=True):
+            writer.write(remove_emojis(chunk, "review_content", inplace=True))
+    return out_path
+
+
 def main():
-    path = "/Users/ericklopez/Desktop/django_gun/empirical/f_data/raw/starbucks_location_coveRd.csv"
-    df = csv_to_df(path)
-    df = remove_emojis(df, "review_content")
-    processed_file_path = "/Users/ericklopez/Desktop/django_gun/empirical/f_data/processed/starbucks_location_coveRd.csv"
-    df.to_csv(path_or_buf=processed_file_path)
+    parser = argparse.ArgumentParser(
+        description="Stage iii: strip emojis from a raw file."
+    )
+    parser.add_argument(
+        "--input",
+        default="/Users/ericklopez/Desktop/django_gun/empirical/f_data/raw/starbucks_location_coveRd.csv",
+    )
+    parser.add_argument(
+        "--output",
+        default="/Users/ericklopez/Desktop/django_gun/empirical/f_data/processed/starbucks_location_coveRd.csv",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Rows per chunk for files larger than memory",
+    )
+    parser.add_argument(
+        "--lake",
+        default=None,
+        help="Data lake root; run preprocess_lake() over its pending partitions instead of --input",
+    )
+    add_lake_filters(parser)
+    args = parser.parse_args()
+    if args.lake:
+        print(
+            f"{preprocess_lake(args.lake, **lake_filters(args))} partitions processed"
+        )
+        return
+    # A .parquet output writes typed Parquet; either way without the index column
+    preprocess_file(args.input, args.output, args.chunksize)
 
 
 if __name__ == "__main__":
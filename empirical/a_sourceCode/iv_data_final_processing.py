@@ -1,11 +1,30 @@
+import argparse
+import hashlib
+import importlib.util
+import inspect
 import pandas as pd
 import numpy as np
 import os
 import sys
 from pathlib import Path
 import re
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.address_cache import AddressCache
+from b_utils.data_lake import DataLake, add_lake_filters, lake_filters
+from b_utils.storage import (
+    TableWriter,
+    compact_dtypes,
+    iter_table,
+    read_table,
+    write_table,
+)
 
 BASE_DIR = Path().resolve().parent.parent
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "f_data"
+)
 
 
 def extract_first_last(name: str) -> tuple[str, str]:
@@ -20,6 +39,58 @@ def extract_first_last(name: str) -> tuple[str, str]:
         return None, None
 
 
+def split_author_names(authors: pd.Series) -> pd.DataFrame:
+    """Vectorized extract_first_last() over a whole review_author column.
+
+    Same rules: first and last whitespace-separated token, title-cased; a
+    single token gives no last name and an empty name neither. Missing
+    authors are treated as empty instead of raising.
+
+    Returns:
+        pd.DataFrame: first_name and last_name (object, None where absent),
+            indexed like authors
+    """
+    names = authors.astype(object).where(authors.notna(), "").astype(str)
+    if _HAS_PYARROW:
+        first, last = _split_names_arrow(names)
+    else:
+        first, last = _split_names_str(names)
+    return pd.DataFrame({"first_name": first, "last_name": last}, index=authors.index)
+
+
+def _split_names_str(names: pd.Series) -> tuple[pd.Series, pd.Series]:
+    tokens = names.str.split()
+    count = tokens.str.len()
+    first = tokens.str[0].str.title().where(count >= 1, None)
+    last = tokens.str[-1].str.title().where(count >= 2, None)
+    return first, last
+
+
+def _split_names_arrow(names: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """pyarrow kernels for plain ASCII names, where they match str.split()/str.title()
+    exactly; any other name goes through _split_names_str()."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    values = pc.ascii_trim_whitespace(pa.array(names.to_numpy(), type=pa.string()))
+    first = pc.struct_field(pc.extract_regex(values, r"^(?P<first>\S+)"), [0])
+    last = pc.struct_field(pc.extract_regex(values, r"\s(?P<last>\S+)$"), [0])
+    first = pd.Series(
+        pc.ascii_title(first).to_numpy(zero_copy_only=False), index=names.index
+    )
+    last = pd.Series(
+        pc.ascii_title(last).to_numpy(zero_copy_only=False), index=names.index
+    )
+
+    # str.split() also splits on \v and \x1c-\x1f, and non-ASCII titles differ
+    plain = pc.match_substring_regex(names.to_numpy(), r"^[ -~\t\n\r\f]*$").to_numpy(
+        zero_copy_only=False
+    )
+    if not plain.all():
+        first[~plain], last[~plain] = _split_names_str(names[~plain])
+    return first.where(first.notna(), None), last.where(last.notna(), None)
+
+
 def parse_subcategory_ratings(s):
     if not isinstance(s, str):
         return pd.Series(
@@ -41,40 +112,248 @@ def parse_subcategory_ratings(s):
     )
 
 
-def extract_address_parts(address: str) -> pd.Series:
-    pattern = r"^(.*),\s*(.*),\s*([A-Z]{2})\s*(\d{5})$"
-    match = re.match(pattern, address.strip()) if isinstance(address, str) else None
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Subcategories with their own column in the final layer (and in the Review model)
+SUBCATEGORIES = ("Food", "Service", "Atmosphere")
+
+# One "Name:score" pair of a "Food:5 | Service:4" category_ratings cell
+_SUBCATEGORY_RATING = r"(?P<name>[^:|]+?)\s*:\s*(?P<score>\d+)"
+
+
+def rating_column(subcategory: str) -> str:
+    """Final column for a subcategory: "Food" -> "food_rating", "Wait time" -> "wait_time_rating"."""
+    return re.sub(r"[^0-9a-z]+", "_", subcategory.lower()).strip("_") + "_rating"
+
+
+def extract_subcategory_ratings(
+    category_ratings: pd.Series, subcategories: tuple = SUBCATEGORIES
+) -> pd.DataFrame:
+    """Vectorized parse_subcategory_ratings() over a whole category_ratings column.
+
+    All "Name:score" pairs are pulled out in one extractall() pass and
+    pivoted to one nullable Int64 column per subcategory, so no Series is
+    built per row.
+
+    Args:
+        category_ratings: Column of "Food:5 | Service:4 | Atmosphere:3" strings (NaN if none)
+        subcategories: Subcategories to return, in this order, whether or not
+            they occur. None returns the three defaults plus every other
+            subcategory found in the data, in order of first appearance.
+
+    Returns:
+        pd.DataFrame: One <name>_rating column per subcategory (see
+            rating_column()), indexed like category_ratings. When a cell
+            repeats a subcategory the first score wins, like re.search().
+    """
+    found = (
+        category_ratings.reset_index(drop=True)
+        .astype("string")
+        .str.extractall(_SUBCATEGORY_RATING)
+    )
+    pairs = pd.DataFrame(
+        {
+            "row": found.index.get_level_values(0),
+            "name": found["name"].str.strip().to_numpy(dtype=object),
+            "score": pd.to_numeric(found["score"]).to_numpy(),
+        }
+    ).drop_duplicates(["row", "name"])
+
+    if subcategories is None:
+        extra = [name for name in pairs["name"].unique() if name not in SUBCATEGORIES]
+        subcategories = (*SUBCATEGORIES, *extra)
+    wide = pairs.pivot(index="row", columns="name", values="score").reindex(
+        index=range(len(category_ratings)), columns=list(subcategories)
+    )
+    wide.columns = [rating_column(name) for name in subcategories]
+    wide.index = category_ratings.index
+    return wide.astype("Int64")
+
+
+ADDRESS_PARTS = ("street", "city", "state", "zip")
+_ADDRESS = re.compile(r"^(.*),\s*(.*),\s*([A-Z]{2})\s*(\d{5})$")
+
+
+def parse_address(address: str) -> dict:
+    """ "5932 SE Federal Hwy, Stuart, FL 34997" -> street/city/state/zip (all None if no match)."""
+    match = _ADDRESS.match(address.strip()) if isinstance(address, str) else None
     if match:
         street, city, state, zip_code = match.groups()
-        return pd.Series(
-            {
-                "street": street.strip().upper(),
-                "city": city.strip().upper(),
-                "state": state.strip().upper(),
-                "zip": zip_code.strip(),
-            }
-        )
+        return {
+            "street": street.strip().upper(),
+            "city": city.strip().upper(),
+            "state": state.strip().upper(),
+            "zip": zip_code.strip(),
+        }
     else:
-        return pd.Series({"street": None, "city": None, "state": None, "zip": None})
+        return dict.fromkeys(ADDRESS_PARTS)
 
 
-def main():
-    BASE_DIR = Path().resolve().parent.parent
-    path = "/Users/ericklopez/desktop/django_gun/empirical/f_data/processed/starbucks_location_coveRd.csv"
-    df = pd.read_csv(path)
-    df[["first_name", "last_name"]] = (
-        df["review_author"].apply(extract_first_last).apply(pd.Series)
+def extract_address_parts(address: str) -> pd.Series:
+    return pd.Series(parse_address(address))
+
+
+# Changes whenever parse_address() or its pattern does, retiring cached parses
+ADDRESS_PARSER_VERSION = hashlib.sha256(
+    (inspect.getsource(parse_address) + _ADDRESS.pattern).encode("utf-8")
+).hexdigest()[:12]
+
+
+def open_address_cache(directory: str = DATA_DIR) -> AddressCache:
+    """The address cache kept in directory (f_data, a lake root or a DAG cache)."""
+    return AddressCache(
+        os.path.join(directory, "_address_cache.jsonl"), ADDRESS_PARSER_VERSION
     )
-    ratings = df["category_ratings"].apply(parse_subcategory_ratings)
-    df[["food_rating", "service_rating", "atmosphere_rating"]] = ratings.astype("Int64")
-    df[["street", "city", "state", "zip"]] = df["business_address"].apply(
-        extract_address_parts
+
+
+def split_addresses(
+    addresses: pd.Series, cache: Optional[AddressCache] = None
+) -> pd.DataFrame:
+    """Vectorized extract_address_parts() over a whole business_address column.
+
+    The column holds one address per store repeated on every review, so it
+    is factorized, each distinct address is parsed once (or looked up in
+    cache, which keeps it for later runs) and the parts are broadcast back
+    by code.
+
+    Returns:
+        pd.DataFrame: street, city, state and zip, indexed like addresses
+    """
+    # astype(object): Parquet layers load the address as a categorical
+    codes, uniques = pd.factorize(addresses.astype(object))
+    if cache is not None:
+        parsed = cache.get_many(uniques, parse_address)
+    else:
+        parsed = [parse_address(address) for address in uniques]
+    # Code -1 (missing address) picks the trailing all-None row
+    table = pd.DataFrame(
+        parsed + [dict.fromkeys(ADDRESS_PARTS)],
+        columns=list(ADDRESS_PARTS),
+        dtype=object,
     )
+    parts = table.take(codes)
+    parts.index = addresses.index
+    return parts
+
+
+def finalize_reviews(
+    df: pd.DataFrame,
+    subcategories: tuple = SUBCATEGORIES,
+    address_cache: Optional[AddressCache] = None,
+) -> pd.DataFrame:
+    """Splits names, subcategory ratings and addresses into the final columns.
+
+    Args:
+        df: Processed reviews
+        subcategories: Subcategory rating columns to produce, see
+            extract_subcategory_ratings(). Keep the fixed default when
+            streaming chunks, so every chunk has the same columns.
+        address_cache: Keeps parsed addresses across runs, see split_addresses()
+
+    Returns:
+        pd.DataFrame: The final columns with the compact_dtypes() profile
+    """
+    df[["first_name", "last_name"]] = split_author_names(df["review_author"])
+    ratings = extract_subcategory_ratings(df["category_ratings"], subcategories)
+    df[list(ratings.columns)] = ratings
+    df[list(ADDRESS_PARTS)] = split_addresses(df["business_address"], address_cache)
     df.drop(
         columns=["review_author", "business_address", "category_ratings"], inplace=True
     )
-    processed_file_path = "/Users/ericklopez/Desktop/django_gun/empirical/f_data/final/starbucks_location_coveRd.csv"
-    df.to_csv(path_or_buf=processed_file_path)
+    return compact_dtypes(df)
+
+
+def finalize_lake(lake_root: str, **filters) -> int:
+    """Runs finalize_reviews() over the processed lake partitions not yet finalized.
+
+    Args:
+        lake_root: DataLake root directory
+        **filters: business / store / since / until, see DataLake.partitions()
+
+    Returns:
+        int: Number of partitions finalized
+    """
+    lake = DataLake(lake_root)
+    cache = open_address_cache(lake_root)
+    pending = lake.pending("processed", "final", **filters)
+    for entry in pending:
+        df = finalize_reviews(
+            lake.read_partition(entry, compact=True), address_cache=cache
+        )
+        lake.write(
+            df, "final", entry.business, entry.store, entry.scrape_date, source=entry
+        )
+    return len(pending)
+
+
+def finalize_file(
+    in_path: str,
+    out_path: str,
+    chunksize: int = None,
+    address_cache: Optional[AddressCache] = None,
+) -> str:
+    """Runs stage iv (finalize_reviews()) from one staged file into another.
+
+    Every transform is row-local, so with chunksize the file is streamed
+    chunk by chunk with peak memory bounded by the chunk, and the output
+    matches the in-memory path row for row.
+
+    Returns:
+        str: out_path
+    """
+    if not chunksize:
+        df = finalize_reviews(
+            read_table(in_path, compact=True), address_cache=address_cache
+        )
+        return write_table(df, out_path)
+
+    with TableWriter(out_path) as writer:
+        for chunk in iter_table(in_path, chunksize, compact=True):
+            writer.write(finalize_reviews(chunk, address_cache=address_cache))
+    return out_path
+
+
+def main():
+    BASE_DIR = Path().resolve().parent.parent
+    parser = argparse.ArgumentParser(
+        description="Stage iv: split names, ratings and addresses."
+    )
+    parser.add_argument(
+        "--input",
+        default="/Users/ericklopez/desktop/django_gun/empirical/f_data/processed/starbucks_location_coveRd.csv",
+    )
+    parser.add_argument(
+        "--output",
+        default="/Users/ericklopez/Desktop/django_gun/empirical/f_data/final/starbucks_location_coveRd.csv",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Rows per chunk for files larger than memory",
+    )
+    parser.add_argument(
+        "--address_cache_dir",
+        default=DATA_DIR,
+        help="Directory of the parsed-address cache",
+    )
+    parser.add_argument(
+        "--lake",
+        default=None,
+        help="Data lake root; run finalize_lake() over its pending partitions instead of --input",
+    )
+    add_lake_filters(parser)
+    args = parser.parse_args()
+    if args.lake:
+        print(f"{finalize_lake(args.lake, **lake_filters(args))} partitions finalized")
+        return
+    # A .parquet output writes typed Parquet; either way without the index column
+    finalize_file(
+        args.input,
+        args.output,
+        args.chunksize,
+        open_address_cache(args.address_cache_dir),
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,479 @@
+import argparse
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from selenium import webdriver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.browser_profile import PROFILES, RESOURCE_TYPE_PATTERNS, get_profile
+from b_utils.helper import get_directory_name
+from b_utils.checkpoint import ScrapeCheckpoint
+from b_utils.data_lake import DataLake, store_slug
+from b_utils.logger import Logger
+from b_utils.scrape_metrics import count, serve_metrics, start_run
+from b_utils.snapshot_archive import SnapshotArchive
+from a_sourceCode.i_web_scraper import PlaceSession, ReviewWatermark, place_key
+from a_sourceCode.ii_stage_data import save_to_csv
+from a_sourceCode.iv_data_final_processing import extract_address_parts
+
+abs_path = get_directory_name(
+    "/Users/ericklopez/Desktop/django_gun/empirical/a_sourceCode"
+)
+inspector_gadget = Logger(abs_path)
+
+RAW_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "f_data", "raw"
+)
+LOG_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "c_logs"
+)
+I_APP_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "i_app"
+)
+
+
+class DriverPool:
+    """Bounded pool of reusable browser sessions shared by scraping threads.
+
+    Sessions are created lazily up to `size` and handed back to the pool after
+    each location, so a sweep of hundreds of URLs pays Chrome start-up only
+    `size` times. A session that errored or timed out is quit and replaced.
+    """
+
+    def __init__(self, size: int, driver_factory: Callable = webdriver.Chrome):
+        if size < 1:
+            raise ValueError("DriverPool size must be at least 1")
+        self.size = size
+        self.driver_factory = driver_factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._created = 0
+
+    @contextmanager
+    def session(self):
+        """Yields a driver; it is returned to the pool unless the block raised."""
+        self._slots.acquire()
+        driver = None
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self.driver_factory()
+                with self._lock:
+                    self._created += 1
+            yield driver
+        except BaseException:
+            self.discard(driver)
+            raise
+        else:
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def discard(self, driver) -> None:
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            inspector_gadget.get_log().warning(f"Could not quit driver: {e}")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    @property
+    def sessions_created(self) -> int:
+        return self._created
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass
+class ScrapeResult:
+    """Outcome of scraping one place URL.
+
+    reviews is emptied once the location is staged, so a long run does not
+    hold every location's reviews; review_count keeps how many there were.
+    """
+
+    url: str
+    address: Optional[str] = None
+    reviews: List[dict] = field(default_factory=list)
+    review_count: int = 0
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    csv_path: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_django_lock = threading.Lock()
+
+
+def load_review_watermark(address: str, business_name: str) -> ReviewWatermark:
+    """Reads the stored high-water mark for the store at `address`.
+
+    Sets up the Django app on first use, the same way import_reviews does, and
+    reads the latest CustomerReview rows through
+    ScrapeEvent.objects.review_watermark().
+    """
+    with _django_lock:
+        import django
+        from django.apps import apps
+
+        if not apps.ready:
+            sys.path.insert(0, I_APP_DIR)
+            os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings.local")
+            django.setup()
+    from starbuck.models import ScrapeEvent
+
+    parts = extract_address_parts(address)
+    if parts.isnull().any():
+        return ReviewWatermark()
+    records = ScrapeEvent.objects.review_watermark(
+        business_name, parts["street"], parts["city"], parts["state"], parts["zip"]
+    )
+    watermark = ReviewWatermark.from_records(records)
+    print(
+        f"Watermark for {address}: {len(watermark.fingerprints)} stored reviews, "
+        f"latest {watermark.latest_date}"
+    )
+    return watermark
+
+
+def scrape_location(
+    driver,
+    url: str,
+    expected_url: str,
+    incremental: bool = False,
+    archive: Optional[SnapshotArchive] = None,
+    checkpoint_dir: Optional[str] = None,
+) -> tuple[str, List[dict]]:
+    """Runs the address, expansion and extraction steps for one place URL.
+
+    With incremental=True only the reviews newer than the store's stored
+    high-water mark are scrolled through and returned. With an archive the
+    raw panel HTML is kept as well (see get_reviews()). With a checkpoint_dir
+    reviews are streamed through a per-place ScrapeCheckpoint, so a retry or
+    a restarted run picks up where the failed attempt stopped.
+    """
+    place = PlaceSession(driver, url, expected_url)
+    address = place.get_address()
+    watermark = None
+    if incremental:
+        business_name = expected_url.rstrip("/").split("/")[-1]
+        watermark = load_review_watermark(address, business_name)
+    if checkpoint_dir is None:
+        place.expand_all_reviews(watermark=watermark)
+        return address, place.get_reviews(
+            mode="script", watermark=watermark, archive=archive
+        )
+
+    checkpoint = ScrapeCheckpoint.for_place(checkpoint_dir, place_key(url))
+    reviews = list(place.iter_reviews(watermark=watermark, checkpoint=checkpoint))
+    if archive is not None:
+        archive.put(
+            driver.page_source,
+            place_key(url),
+            checkpoint.scraped_at,
+            driver.current_url,
+        )
+    return address, reviews
+
+
+def _scrape_with_retries(
+    pool: DriverPool,
+    url: str,
+    expected_url: str,
+    timeout: float,
+    retries: int,
+    incremental: bool = False,
+    archive: Optional[SnapshotArchive] = None,
+    checkpoint_dir: Optional[str] = None,
+) -> ScrapeResult:
+    result = ScrapeResult(url=url)
+    start = time.perf_counter()
+    while result.attempts <= retries:
+        result.attempts += 1
+        try:
+            with pool.session() as driver:
+                driver.set_page_load_timeout(timeout)
+                # Watchdog: quitting the session makes the in-flight WebDriver
+                # call raise, which frees this thread and triggers a retry.
+                timed_out = threading.Event()
+
+                def kill_session(driver=driver):
+                    timed_out.set()
+                    pool.discard(driver)
+
+                watchdog = threading.Timer(timeout, kill_session)
+                watchdog.start()
+                try:
+                    result.address, result.reviews = scrape_location(
+                        driver,
+                        url,
+                        expected_url,
+                        incremental=incremental,
+                        archive=archive,
+                        checkpoint_dir=checkpoint_dir,
+                    )
+                finally:
+                    watchdog.cancel()
+                if timed_out.is_set():
+                    raise TimeoutError(f"Location exceeded {timeout:.0f}s")
+            result.error = None
+            break
+        except AssertionError as e:
+            # Wrong page, retrying would land on the same redirect
+            result.error = str(e)
+            break
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            inspector_gadget.get_log().warning(
+                f"Attempt {result.attempts}/{retries + 1} failed for {url}: {result.error}"
+            )
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def location_filename(address: str, business_name: str = "starbucks") -> str:
+    """Builds a stable CSV name such as
+    starbucks_location_5932_se_federal_hwy_stuart_fl_34997.csv.
+
+    The whole address goes into the name: two stores on the same street
+    address in different cities must not overwrite each other's file.
+    """
+    slug = re.sub(r"[^0-9a-z]+", "_", (address or "").lower()).strip("_") or "unknown"
+    return f"{business_name.lower()}_location_{slug}.csv"
+
+
+def scrape_locations(
+    urls: List[str],
+    expected_url: str,
+    file_path: str = RAW_DATA_DIR,
+    workers: int = 4,
+    timeout: float = 900,
+    retries: int = 2,
+    driver_factory: Callable = webdriver.Chrome,
+    incremental: bool = False,
+    archive_dir: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    metrics_json: Optional[str] = None,
+    compression: Optional[str] = None,
+    lake_root: Optional[str] = None,
+) -> List[ScrapeResult]:
+    """Scrapes many place URLs in parallel and stages each one with save_to_csv().
+
+    Args:
+        urls: Google Maps place URLs to scrape
+        expected_url: URL prefix every place must resolve to (see verify_url())
+        file_path: Directory the per-location CSVs are written to
+        workers: Number of concurrent browser sessions
+        timeout: Seconds one location may take before its session is killed
+        retries: Extra attempts per location after a failure
+        driver_factory: Callable returning a new WebDriver
+        incremental: Only scrape reviews newer than each store's stored watermark
+        archive_dir: Keep every location's raw HTML in a SnapshotArchive there
+        checkpoint_dir: Checkpoint each location's scroll there and resume
+            from it on retries and restarted runs
+        metrics_json: Where to write the run's per-phase timing summary
+            (default: c_logs/scrape_run_<start time>.json)
+        compression: Stage the CSVs "gzip" or "zstd" compressed
+        lake_root: Stage into the raw layer of a DataLake there (one partition
+            per business / store / scrape date) instead of flat under file_path
+
+    Returns:
+        List[ScrapeResult]: One result per URL, in completion order
+    """
+    results = []
+    run = start_run("scrape_locations")
+    lake = DataLake(lake_root) if lake_root else None
+    business_name = expected_url.rstrip("/").split("/")[-1]
+    archive = SnapshotArchive(archive_dir) if archive_dir else None
+    start = time.perf_counter()
+    with DriverPool(workers, driver_factory) as pool, ThreadPoolExecutor(
+        max_workers=workers
+    ) as executor:
+        futures = {
+            executor.submit(
+                _scrape_with_retries,
+                pool,
+                url,
+                expected_url,
+                timeout,
+                retries,
+                incremental,
+                archive,
+                checkpoint_dir,
+            ): url
+            for url in urls
+        }
+        # Collector: the CSV writes happen on this thread only
+        for future in as_completed(futures):
+            result = future.result()
+            count("locations_scraped" if result.ok else "locations_failed")
+            # A location whose address lookup failed is named by its place
+            # instead, so such locations do not all overwrite "unknown"
+            location = result.address or place_key(result.url)
+            if result.ok and lake is not None:
+                scrape_date = run.started_at.date()
+                store = store_slug(location)
+                result.csv_path = save_to_csv(
+                    result.address,
+                    result.reviews,
+                    file_path=lake.partition_dir(
+                        "raw", business_name, store, scrape_date
+                    ),
+                    filename="part-0000.csv",
+                    compression=compression,
+                )
+                lake.register(result.csv_path, "raw", business_name, store, scrape_date)
+            elif result.ok:
+                result.csv_path = save_to_csv(
+                    result.address,
+                    result.reviews,
+                    file_path=file_path,
+                    filename=location_filename(location, business_name),
+                    compression=compression,
+                )
+            else:
+                inspector_gadget.get_log().error(
+                    f"Giving up on {result.url} after {result.attempts} attempts: {result.error}"
+                )
+            result.review_count = len(result.reviews)
+            result.reviews = []
+            results.append(result)
+            print(
+                f"[{len(results)}/{len(urls)}] {'OK' if result.ok else 'FAILED'} "
+                f"{result.address or result.url} ({result.elapsed:.0f}s)"
+            )
+        sessions = pool.sessions_created
+
+    elapsed = time.perf_counter() - start
+    succeeded = sum(result.ok for result in results)
+    per_hour = succeeded / elapsed * 3600 if elapsed else 0.0
+    summary = (
+        f"Scraped {succeeded}/{len(urls)} locations in {elapsed:.0f}s with "
+        f"{sessions} browser sessions: {per_hour:.1f} locations/hour"
+    )
+    print(summary)
+    inspector_gadget.get_log().info(summary)
+
+    metrics_json = metrics_json or os.path.join(
+        LOG_DIR, f"scrape_run_{run.started_at:%Y%m%d_%H%M%S}.json"
+    )
+    print(f"Run metrics written to {run.write_json(metrics_json)}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scrape Google Maps reviews for many place URLs in parallel."
+    )
+    parser.add_argument("url_file", help="Text file with one place URL per line")
+    parser.add_argument("--expected_url", default="google.com/maps/place/Starbucks")
+    parser.add_argument("--file_path", default=RAW_DATA_DIR)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=900)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument(
+        "--profile",
+        default="default",
+        choices=sorted(PROFILES),
+        help="Browser profile (see b_utils/browser_profile.py)",
+    )
+    parser.add_argument(
+        "--block",
+        nargs="+",
+        default=None,
+        choices=sorted(RESOURCE_TYPE_PATTERNS),
+        help="Resource types to block, overriding the profile's list",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Stop each store at the newest review already in the database",
+    )
+    parser.add_argument(
+        "--archive_dir",
+        default=None,
+        help="Also keep the raw review-panel HTML in a snapshot archive there",
+    )
+    parser.add_argument(
+        "--checkpoint_dir",
+        default=None,
+        help="Checkpoint long review scrolls there and resume interrupted ones",
+    )
+    parser.add_argument(
+        "--metrics_json",
+        default=None,
+        help="Per-run timing summary path (default: c_logs/scrape_run_<time>.json)",
+    )
+    parser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port while the run lasts",
+    )
+    parser.add_argument(
+        "--compression",
+        default=None,
+        choices=["gzip", "zstd"],
+        help="Compress the staged CSVs",
+    )
+    parser.add_argument(
+        "--lake_root",
+        default=None,
+        help="Stage into a partitioned data lake (see b_utils/data_lake.py) there",
+    )
+    args = parser.parse_args()
+
+    with open(args.url_file) as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    overrides = {}
+    if args.block is not None:
+        overrides["blocked_resource_types"] = tuple(args.block)
+    profile = get_profile(args.profile, **overrides)
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+
+    scrape_locations(
+        urls,
+        args.expected_url,
+        file_path=args.file_path,
+        workers=args.workers,
+        timeout=args.timeout,
+        retries=args.retries,
+        driver_factory=profile.create_driver,
+        incremental=args.incremental,
+        archive_dir=args.archive_dir,
+        checkpoint_dir=args.checkpoint_dir,
+        metrics_json=args.metrics_json,
+        compression=args.compression,
+        lake_root=args.lake_root,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.browser_profile import PROFILES, get_profile
+from b_utils.helper import get_directory_name
+from b_utils.logger import Logger
+from b_utils.storage import compact_dtypes, read_table, write_table
+from a_sourceCode.i_web_scraper import PlaceSession
+from a_sourceCode.ii_stage_data import FIELDNAMES, _review_row
+from a_sourceCode.iii_data_pre_processing import remove_emojis
+from a_sourceCode.iv_data_final_processing import finalize_reviews
+
+abs_path = get_directory_name(
+    "/Users/ericklopez/Desktop/django_gun/empirical/a_sourceCode"
+)
+inspector_gadget = Logger(abs_path)
+
+I_APP_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "i_app"
+)
+
+
+@dataclass
+class PipelineReport:
+    """Seconds and output rows per pipeline stage, in run order."""
+
+    seconds: dict = field(default_factory=dict)
+    rows: dict = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = time.perf_counter() - start
+
+    def report(self) -> str:
+        total = sum(self.seconds.values())
+        lines = [f"{'stage':<12} {'seconds':>9} {'share':>6} {'rows':>8}"]
+        for name, seconds in self.seconds.items():
+            share = seconds / total * 100 if total else 0.0
+            lines.append(
+                f"{name:<12} {seconds:>9.3f} {share:>5.0f}% {self.rows.get(name, ''):>8}"
+            )
+        lines.append(f"{'total':<12} {total:>9.3f}")
+        return "\n".join(lines)
+
+
+def run_pipeline(
+    business_address: str,
+    reviews: Iterable[dict],
+    business_name: str = "STARBUCKS",
+    source: str = "GOOGLE MAPS",
+    load: bool = True,
+    audit_dir: Optional[str] = None,
+    audit_format: str = "csv",
+    report: Optional[PipelineReport] = None,
+) -> tuple[pd.DataFrame, PipelineReport]:
+    """Runs stages ii -> iii -> iv -> DB load on one location without intermediate files.
+
+    The same transformations as save_to_csv(), remove_emojis(),
+    finalize_reviews() and import_reviews run back to back on one DataFrame,
+    so nothing is serialized and parsed again between stages.
+
+    Args:
+        business_address: String from get_address()
+        reviews: Review dicts from get_reviews() / iter_reviews()
+        business_name: ScrapeEvent business name for the DB load
+        source: ScrapeEvent source for the DB load
+        load: Import the final rows into the database
+        audit_dir: Also write each stage's output there (raw, processed,
+            final), for audit only; nothing downstream reads them
+        audit_format: "csv" or "parquet" for the audit files
+        report: PipelineReport to add to (e.g. one that already timed the scrape)
+
+    Returns:
+        (final DataFrame, PipelineReport)
+    """
+    report = report or PipelineReport()
+
+    with report.stage("stage"):
+        df = pd.DataFrame.from_records(
+            [_review_row(business_address, review) for review in reviews],
+            columns=FIELDNAMES,
+        )
+        df = compact_dtypes(df, label="staged reviews")
+    report.rows["stage"] = len(df)
+    _audit(df, audit_dir, "raw", audit_format)
+
+    with report.stage("preprocess"):
+        df = remove_emojis(df, "review_content")
+    report.rows["preprocess"] = len(df)
+    _audit(df, audit_dir, "processed", audit_format)
+
+    with report.stage("finalize"):
+        df = finalize_reviews(df)
+    report.rows["finalize"] = len(df)
+    _audit(df, audit_dir, "final", audit_format)
+
+    if load:
+        with report.stage("load"):
+            report.rows["load"] = load_reviews(df, business_name, source)
+
+    print(report.report())
+    inspector_gadget.get_log().info(f"Pipeline stage seconds: {report.seconds}")
+    return df, report
+
+
+def scrape_and_run(
+    driver, url: str, expected_url: str, **kwargs
+) -> tuple[pd.DataFrame, PipelineReport]:
+    """Scrapes one place and feeds the reviews straight into run_pipeline()."""
+    report = PipelineReport()
+    with report.stage("scrape"):
+        place = PlaceSession(driver, url, expected_url)
+        address = place.get_address()
+        place.expand_all_reviews()
+        reviews = place.get_reviews(mode="script")
+    report.rows["scrape"] = len(reviews)
+    return run_pipeline(address, reviews, report=report, **kwargs)
+
+
+def load_reviews(df: pd.DataFrame, business_name: str, source: str) -> int:
+    """Imports final rows through the import_reviews command's loader; returns rows imported."""
+    sys.path.insert(0, I_APP_DIR)
+    from starbuck.management.commands.import_reviews import Command
+
+    command = Command()  # Sets up Django like the CLI does
+    df = df.sort_values(by="review_date", ascending=False)
+    return command.import_data(
+        command.plain_values(df), business_name=business_name, source=source
+    )
+
+
+def _audit(
+    df: pd.DataFrame, audit_dir: Optional[str], layer: str, audit_format: str
+) -> None:
+    if audit_dir:
+        write_table(df, os.path.join(audit_dir, f"{layer}.{audit_format}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scrape (or read a raw file) and run stages ii-iv plus the DB load in memory."
+    )
+    parser.add_argument("--url", help="Google Maps place URL to scrape")
+    parser.add_argument("--expected_url", default="google.com/maps/place/Starbucks")
+    parser.add_argument("--profile", default="default", choices=sorted(PROFILES))
+    parser.add_argument(
+        "--raw_file", help="Start from an existing raw CSV/Parquet instead"
+    )
+    parser.add_argument("--business_name", default="STARBUCKS")
+    parser.add_argument("--source", default="GOOGLE MAPS")
+    parser.add_argument("--no_load", action="store_true", help="Skip the DB import")
+    parser.add_argument("--audit_dir", default=None)
+    parser.add_argument("--audit_format", default="csv", choices=["csv", "parquet"])
+    args = parser.parse_args()
+
+    options = dict(
+        business_name=args.business_name,
+        source=args.source,
+        load=not args.no_load,
+        audit_dir=args.audit_dir,
+        audit_format=args.audit_format,
+    )
+    if args.raw_file:
+        raw = read_table(args.raw_file)
+        reviews = [
+            {
+                "author": row["review_author"],
+                "date": row["review_date"],
+                "date_relative": row.get("review_date_relative", ""),
+                "overall_stars": row["review_rating"],
+                "content": row["review_content"],
+                "category_ratings": (
+                    str(row["category_ratings"]).split(" | ")
+                    if isinstance(row["category_ratings"], str)
+                    else []
+                ),
+                "scraped_at": row.get("scraped_at", ""),
+            }
+            for row in raw.to_dict("records")
+        ]
+        run_pipeline(raw["business_address"].iloc[0], reviews, **options)
+    elif args.url:
+        with get_profile(args.profile).create_driver() as driver:
+            scrape_and_run(driver, args.url, args.expected_url, **options)
+    else:
+        parser.error("either --url or --raw_file is required")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from graphlib import TopologicalSorter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.data_lake import file_sha256
+from b_utils.helper import get_directory_name
+from b_utils.logger import Logger
+from b_utils.storage import is_parquet, read_table
+from a_sourceCode.i_web_scraper import parse_page_address, parse_review_dump
+from a_sourceCode.ii_stage_data import save_to_csv
+from a_sourceCode.iii_data_pre_processing import preprocess_file
+from a_sourceCode.iv_data_final_processing import finalize_file, open_address_cache
+
+abs_path = get_directory_name(
+    "/Users/ericklopez/Desktop/django_gun/empirical/a_sourceCode"
+)
+inspector_gadget = Logger(abs_path)
+
+EMPIRICAL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAG_CACHE_DIR = os.path.join(EMPIRICAL_DIR, "f_data", "_dag_cache")
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the pipeline DAG.
+
+    Args:
+        name: Stage name, also its sub-directory in the cache
+        inputs: Artifacts the stage reads, e.g. ("processed",)
+        output: Artifact the stage writes, e.g. "final"
+        run: (input paths by artifact, output path, params) -> None
+        code: Files, relative to empirical/, whose contents version the stage
+        params: Run options that change the output, e.g. ("fmt",); part of
+            the fingerprint
+        table: The output is a review table (.csv/.parquet by fmt), else .json
+    """
+
+    name: str
+    inputs: Tuple[str, ...]
+    output: str
+    run: Callable[[Dict[str, str], str, dict], None]
+    code: Tuple[str, ...]
+    params: Tuple[str, ...] = ()
+    table: bool = True
+
+
+@dataclass
+class StageRun:
+    """What happened to one stage for one source file."""
+
+    source: str
+    stage: str
+    fingerprint: str
+    path: str
+    cached: bool
+    seconds: float
+
+
+def _parse_page(inputs: Dict[str, str], out_path: str, params: dict) -> None:
+    opener = gzip.open if inputs["page"].endswith(".gz") else open
+    with opener(inputs["page"], "rt", encoding="utf-8") as f:
+        page_html = f.read()
+    parsed = {
+        "address": parse_page_address(page_html),
+        "reviews": parse_review_dump(
+            page_html, datetime.fromisoformat(params["anchor"])
+        ),
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(parsed, f, default=str)
+
+
+def _stage_reviews(inputs: Dict[str, str], out_path: str, params: dict) -> None:
+    with open(inputs["reviews"], encoding="utf-8") as f:
+        parsed = json.load(f)
+    save_to_csv(
+        parsed["address"],
+        parsed["reviews"],
+        file_path=os.path.dirname(out_path),
+        filename=os.path.basename(out_path),
+    )
+
+
+def _preprocess(inputs: Dict[str, str], out_path: str, params: dict) -> None:
+    preprocess_file(inputs["raw"], out_path, params.get("chunksize"))
+
+
+def _finalize(inputs: Dict[str, str], out_path: str, params: dict) -> None:
+    cache = (
+        open_address_cache(params["address_cache_dir"])
+        if params.get("address_cache_dir")
+        else None
+    )
+    finalize_file(inputs["processed"], out_path, params.get("chunksize"), cache)
+
+
+def _import(inputs: Dict[str, str], out_path: str, params: dict) -> None:
+    from a_sourceCode.vi_pipeline import (
+        load_reviews,
+    )  # Sets up Django only when loading
+
+    rows = load_reviews(
+        read_table(inputs["final"], compact=True),
+        params["business_name"],
+        params["source"],
+    )
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"rows": rows, "imported_at": datetime.now().isoformat(timespec="seconds")},
+            f,
+        )
+
+
+# Stages i-iv and the DB import. Declaration order does not matter; the DAG
+# is ordered by artifacts, and a source enters at whichever artifact it is.
+STAGES = (
+    Stage(
+        "parse",
+        inputs=("page",),
+        output="reviews",
+        run=_parse_page,
+        code=("a_sourceCode/vii_stage_dag.py", "a_sourceCode/i_web_scraper.py"),
+        params=("anchor",),
+        table=False,
+    ),
+    Stage(
+        "stage",
+        inputs=("reviews",),
+        output="raw",
+        run=_stage_reviews,
+        code=(
+            "a_sourceCode/vii_stage_dag.py",
+            "a_sourceCode/ii_stage_data.py",
+            "b_utils/storage.py",
+        ),
+        params=("fmt",),
+    ),
+    Stage(
+        "preprocess",
+        inputs=("raw",),
+        output="processed",
+        run=_preprocess,
+        code=(
+            "a_sourceCode/vii_stage_dag.py",
+            "a_sourceCode/iii_data_pre_processing.py",
+            "b_utils/storage.py",
+        ),
+        params=("fmt",),
+    ),
+    Stage(
+        "finalize",
+        inputs=("processed",),
+        output="final",
+        run=_finalize,
+        code=(
+            "a_sourceCode/vii_stage_dag.py",
+            "a_sourceCode/iv_data_final_processing.py",
+            "b_utils/address_cache.py",
+            "b_utils/storage.py",
+        ),
+        params=("fmt",),
+    ),
+    Stage(
+        "import",
+        inputs=("final",),
+        output="imported",
+        run=_import,
+        code=(
+            "a_sourceCode/vii_stage_dag.py",
+            "a_sourceCode/vi_pipeline.py",
+            "i_app/starbuck/management/commands/import_reviews.py",
+            "i_app/starbuck/models.py",
+        ),
+        params=("business_name", "source"),
+        table=False,
+    ),
+)
+
+# Artifacts written to out_dir/<artifact>/, mirroring f_data/raw|processed|final
+PUBLISHED_ARTIFACTS = ("raw", "processed", "final")
+
+
+def stage_order(stages: Sequence[Stage] = STAGES) -> List[Stage]:
+    """Stages in dependency order: each after the stages producing its inputs."""
+    producers = {stage.output: stage.name for stage in stages}
+    graph = {
+        stage.name: {producers[a] for a in stage.inputs if a in producers}
+        for stage in stages
+    }
+    by_name = {stage.name: stage for stage in stages}
+    return [by_name[name] for name in TopologicalSorter(graph).static_order()]
+
+
+@lru_cache(maxsize=None)
+def code_version(files: Tuple[str, ...]) -> str:
+    """Hash of the source files a stage runs; any edit to them invalidates its cache."""
+    digest = hashlib.sha256()
+    for rel_path in files:
+        path = os.path.join(EMPIRICAL_DIR, rel_path)
+        digest.update(rel_path.encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def source_key(path: str) -> str:
+    """Names a source by file name plus a hash of its absolute path, e.g.
+    "store0-1f3a9c2e", so same-named files in different folders stay apart."""
+    digest = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return f"{os.path.basename(path).split('.')[0]}-{digest[:8]}"
+
+
+def stage_fingerprint(
+    stage: Stage, input_hashes: Dict[str, str], params: dict, source: str = ""
+) -> str:
+    """Content hash of everything the stage's output depends on: its input
+    files' bytes, its code, the params it declares and the source it is for."""
+    key = {
+        "stage": stage.name,
+        "source": source,
+        "code": code_version(stage.code),
+        "inputs": {artifact: input_hashes[artifact] for artifact in stage.inputs},
+        "params": {name: params.get(name) for name in stage.params},
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def source_artifact(path: str) -> str:
+    """The artifact a source file is: a saved page ("page") or a raw review table ("raw")."""
+    name = os.path.basename(path).lower()
+    if name.endswith((".html", ".html.gz", ".htm")):
+        return "page"
+    if is_parquet(name) or name.endswith((".csv", ".csv.gz", ".csv.zst")):
+        return "raw"
+    raise ValueError(
+        f"{path} is neither a saved page (.html[.gz]) nor a raw review file"
+    )
+
+
+def run_source(
+    source_path: str,
+    cache_dir: str,
+    params: dict,
+    stages: Sequence[Stage] = STAGES,
+    force: Iterable[str] = (),
+    out_dir: Optional[str] = None,
+) -> List[StageRun]:
+    """Runs the DAG for one source file, reusing every stage output already cached.
+
+    A stage's output is stored under its fingerprint (see stage_fingerprint()),
+    so it is recomputed only when its input bytes, its code or its params
+    change. Downstream stages hash the new output; if it came out identical,
+    they are served from the cache again.
+
+    Args:
+        source_path: Saved page or raw review file, see source_artifact()
+        cache_dir: Content-addressed stage outputs
+        params: fmt, anchor, chunksize, address_cache_dir, business_name, source
+        stages: The DAG, STAGES by default
+        force: Stage names to rerun even when cached
+        out_dir: Also publish raw/processed/final to out_dir/<artifact>/
+
+    Returns:
+        List[StageRun]: One per stage that applies to this source, in run order
+    """
+    artifacts = {source_artifact(source_path): source_path}
+    hashes = {artifact: file_sha256(path) for artifact, path in artifacts.items()}
+    stem = source_key(source_path)
+    runs = []
+    for stage in stage_order(stages):
+        if not all(artifact in artifacts for artifact in stage.inputs):
+            continue  # Upstream of where this source enters the DAG
+        fingerprint = stage_fingerprint(stage, hashes, params, stem)
+        extension = f".{params.get('fmt', 'csv')}" if stage.table else ".json"
+        out_path = os.path.join(
+            cache_dir, stage.name, fingerprint[:2], fingerprint + extension
+        )
+        cached = os.path.exists(out_path) and stage.name not in force
+
+        start = time.perf_counter()
+        if not cached:
+            _run_stage(stage, {a: artifacts[a] for a in stage.inputs}, out_path, params)
+        runs.append(
+            StageRun(
+                stem,
+                stage.name,
+                fingerprint,
+                out_path,
+                cached,
+                time.perf_counter() - start,
+            )
+        )
+        artifacts[stage.output] = out_path
+        hashes[stage.output] = file_sha256(out_path)
+
+        if out_dir and stage.output in PUBLISHED_ARTIFACTS:
+            target = os.path.join(out_dir, stage.output, stem + extension)
+            _publish(out_path, target, hashes[stage.output])
+    return runs
+
+
+def run_dag(
+    sources: Iterable[str],
+    cache_dir: str = DAG_CACHE_DIR,
+    fmt: str = "csv",
+    load: bool = True,
+    business_name: str = "STARBUCKS",
+    source: str = "GOOGLE MAPS",
+    anchor: Optional[datetime] = None,
+    chunksize: Optional[int] = None,
+    force: Iterable[str] = (),
+    out_dir: Optional[str] = None,
+) -> List[StageRun]:
+    """Brings every source file through stages i-iv (and the DB import) incrementally.
+
+    Rerunning after a change recomputes only the stages and files it affects:
+    a new page reruns that page's chain, an edit to stage iii's code reruns
+    preprocess (and finalize/import only where the processed bytes changed).
+
+    Args:
+        sources: Saved pages (.html/.html.gz) and/or raw review files
+        cache_dir: Where stage outputs are kept by fingerprint
+        fmt: "csv" or "parquet" for the raw/processed/final tables
+        load: Include the DB import stage
+        business_name / source: ScrapeEvent fields for the import
+        anchor: Scrape time for a page's relative dates (default: the
+            page file's modification time)
+        chunksize: Stream stages iii/iv chunksize rows at a time (output is identical)
+        force: Stage names to rerun regardless of the cache
+        out_dir: Also publish raw/processed/final to out_dir/<artifact>/<source_key()>
+
+    Returns:
+        List[StageRun]: Every stage run, source by source
+    """
+    stages = [stage for stage in STAGES if load or stage.name != "import"]
+    runs = []
+    for path in sources:
+        params = {
+            "fmt": fmt,
+            "anchor": (
+                anchor or datetime.fromtimestamp(os.path.getmtime(path))
+            ).isoformat(timespec="seconds"),
+            "chunksize": chunksize,
+            "address_cache_dir": cache_dir,
+            "business_name": business_name,
+            "source": source,
+        }
+        runs.extend(run_source(path, cache_dir, params, stages, force, out_dir))
+
+    print(report(runs))
+    ran = sum(not run.cached for run in runs)
+    inspector_gadget.get_log().info(
+        f"run_dag(): {ran} stages ran, {len(runs) - ran} cached"
+    )
+    return runs
+
+
+def report(runs: List[StageRun]) -> str:
+    lines = [f"{'source':<32} {'stage':<11} {'status':<7} {'seconds':>8}"]
+    for run in runs:
+        status = "cached" if run.cached else "ran"
+        lines.append(
+            f"{run.source[:32]:<32} {run.stage:<11} {status:<7} {run.seconds:>8.3f}"
+        )
+    ran = sum(not run.cached for run in runs)
+    lines.append(f"{ran} of {len(runs)} stages ran")
+    return "\n".join(lines)
+
+
+def _run_stage(
+    stage: Stage, inputs: Dict[str, str], out_path: str, params: dict
+) -> None:
+    """Runs a stage into a hidden temp file beside out_path, then renames it into
+    place, so an interrupted stage never leaves a cache entry behind."""
+    directory = os.path.dirname(out_path)
+    os.makedirs(directory, exist_ok=True)
+    # Keeps the extension, which picks the output format
+    tmp_path = os.path.join(
+        directory, f".{uuid.uuid4().hex}.{os.path.basename(out_path)}"
+    )
+    try:
+        stage.run(inputs, tmp_path, params)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _publish(cached_path: str, target: str, sha256: str) -> None:
+    """Copies a stage output to target unless target already holds the same bytes
+    (a cache hit can still differ from what was published last, e.g. after a revert)."""
+    if os.path.exists(target) and file_sha256(target) == sha256:
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_path = f"{target}.tmp"
+    shutil.copyfile(cached_path, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run stages i-iv and the DB import over source files, skipping cached stages."
+    )
+    parser.add_argument(
+        "sources", nargs="+", help="Saved pages (.html/.html.gz) or raw review files"
+    )
+    parser.add_argument("--cache_dir", default=DAG_CACHE_DIR)
+    parser.add_argument(
+        "--out_dir", default=None, help="Publish raw/processed/final here, e.g. f_data"
+    )
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"])
+    parser.add_argument("--chunksize", type=int, default=None)
+    parser.add_argument(
+        "--anchor",
+        default=None,
+        help="Scrape time of the pages (ISO); default: file mtime",
+    )
+    parser.add_argument("--business_name", default="STARBUCKS")
+    parser.add_argument("--source", default="GOOGLE MAPS")
+    parser.add_argument(
+        "--no_load", action="store_true", help="Skip the DB import stage"
+    )
+    parser.add_argument(
+        "--force", nargs="*", default=[], choices=[stage.name for stage in STAGES]
+    )
+    args = parser.parse_args()
+
+    run_dag(
+        args.sources,
+        cache_dir=args.cache_dir,
+        fmt=args.format,
+        load=not args.no_load,
+        business_name=args.business_name,
+        source=args.source,
+        anchor=datetime.fromisoformat(args.anchor) if args.anchor else None,
+        chunksize=args.chunksize,
+        force=args.force,
+        out_dir=args.out_dir,
+    )
+
+
+if __name__ == "__main__":
+    main()
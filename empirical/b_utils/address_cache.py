@@ -0,0 +1,76 @@
+import os
+import threading
+from typing import Callable, Iterable, List
+
+from b_utils.jsonl import append_jsonl, iter_jsonl, truncate_jsonl
+
+
+class AddressCache:
+    """Parsed business addresses keyed on parser version and raw address, kept on disk.
+
+    The file is JSON lines, one {"version": ..., "address": ..., "parts": {...}}
+    per parse, appended as new addresses turn up, so a store's address is
+    parsed once per parser version rather than once per run. Lines written
+    by another parser version are ignored, so a parser fix takes effect
+    without deleting the file. Addresses that do not parse are cached too
+    (with None parts). A torn final line is cut off on load, so later
+    appends land on a clean line.
+
+    Example:
+        cache = AddressCache("f_data/_address_cache.jsonl", ADDRESS_PARSER_VERSION)
+        parts = cache.get_many(unique_addresses, parse_address)
+    """
+
+    def __init__(self, path: str, version: str):
+        self.path = path
+        self.version = version
+        self._parts = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._parts
+
+    def load(self) -> None:
+        good_offset = 0
+        for entry, good_offset in iter_jsonl(self.path):
+            if entry.get("version") == self.version:
+                self._parts[entry["address"]] = entry["parts"]
+        truncate_jsonl(self.path, good_offset)
+
+    def get_many(
+        self, addresses: Iterable[str], parse: Callable[[str], dict]
+    ) -> List[dict]:
+        """Parts for each address, in order; addresses not cached yet are parsed
+        with parse() and appended to the file.
+
+        Args:
+            addresses: Raw address strings (unique ones, ideally)
+            parse: address -> dict of parts, e.g. {"street": ..., "city": ...}
+
+        Returns:
+            List[dict]: One parts dict per address
+        """
+        addresses = list(addresses)
+        with self._lock:
+            missing = [a for a in dict.fromkeys(addresses) if a not in self._parts]
+            if missing:
+                new = {address: parse(address) for address in missing}
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                append_jsonl(
+                    self.path,
+                    (
+                        {"version": self.version, "address": address, "parts": parts}
+                        for address, parts in new.items()
+                    ),
+                )
+                self._parts.update(new)
+        return [self._parts[address] for address in addresses]
+
+
+if __name__ == "__main__":
+    pass
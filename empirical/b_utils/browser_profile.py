@@ -0,0 +1,115 @@
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+from selenium import webdriver
+
+# Chrome DevTools' Network.setBlockedURLs only matches URL wildcards, so each
+# resource type is blocked through the URL patterns that serve it on Maps.
+RESOURCE_TYPE_PATTERNS = {
+    "Image": (
+        "*.png*",
+        "*.jpg*",
+        "*.jpeg*",
+        "*.gif*",
+        "*.webp*",
+        "*.svg*",
+        "*.ico*",
+        "*/maps/vt*",  # map tiles
+        "*/kh/v*",  # satellite tiles
+        "*googleusercontent.com/*",  # place photos and reviewer avatars
+    ),
+    "Font": ("*.woff*", "*.ttf*", "*.otf*", "*fonts.gstatic.com/*"),
+    "Media": ("*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*"),
+}
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """Chrome settings for a scraping session.
+
+    Args:
+        name: Profile name used on the command line
+        headless: Run Chrome without a window
+        block_images: Turn off image loading through Chrome content settings
+        window_size: (width, height) of the viewport, None for Chrome's default
+        blocked_resource_types: Keys of RESOURCE_TYPE_PATTERNS to block
+        blocked_url_patterns: Extra URL wildcards to block through CDP
+    """
+
+    name: str
+    headless: bool = False
+    block_images: bool = False
+    window_size: Optional[Tuple[int, int]] = None
+    blocked_resource_types: Tuple[str, ...] = ()
+    blocked_url_patterns: Tuple[str, ...] = ()
+
+    def blocked_urls(self) -> list[str]:
+        patterns = []
+        for resource_type in self.blocked_resource_types:
+            if resource_type not in RESOURCE_TYPE_PATTERNS:
+                raise ValueError(
+                    f"Unknown resource type {resource_type}; "
+                    f"choose from {sorted(RESOURCE_TYPE_PATTERNS)}"
+                )
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        patterns.extend(self.blocked_url_patterns)
+        return patterns
+
+    def chrome_options(self) -> webdriver.ChromeOptions:
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+        if self.window_size:
+            options.add_argument(
+                f"--window-size={self.window_size[0]},{self.window_size[1]}"
+            )
+        if self.block_images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        return options
+
+    def create_driver(self):
+        """Starts Chrome with this profile and installs the CDP request blocklist."""
+        driver = webdriver.Chrome(options=self.chrome_options())
+        blocked = self.blocked_urls()
+        if blocked:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+        return driver
+
+
+PROFILES = {
+    "default": BrowserProfile("default"),
+    "headless": BrowserProfile("headless", headless=True),
+    "no_images": BrowserProfile("no_images", block_images=True),
+    "small_viewport": BrowserProfile("small_viewport", window_size=(800, 600)),
+    # Everything the review panel does not need to render its text
+    "lightweight": BrowserProfile(
+        "lightweight",
+        headless=True,
+        block_images=True,
+        window_size=(800, 600),
+        blocked_resource_types=("Image", "Font", "Media"),
+    ),
+}
+
+
+def get_profile(name: str, **overrides) -> BrowserProfile:
+    """Looks up a profile by name, optionally overriding some of its fields.
+
+    Example:
+        get_profile("headless", blocked_resource_types=("Image",)).create_driver()
+    """
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown browser profile {name}; choose from {sorted(PROFILES)}"
+        )
+    return replace(PROFILES[name], **overrides) if overrides else PROFILES[name]
+
+
+if __name__ == "__main__":
+    pass
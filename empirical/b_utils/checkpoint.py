@@ -0,0 +1,140 @@
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Iterator, List, Optional
+
+from b_utils.jsonl import append_jsonl, iter_jsonl, truncate_jsonl
+
+# Cards re-read before a checkpoint's position on resume, in case reviews
+# posted since the interrupted run shifted the list
+RESUME_OVERLAP = 20
+
+
+class ScrapeCheckpoint:
+    """Append-only on-disk progress of one location's review scroll.
+
+    The file is JSON lines: a "meta" line with the scrape anchor, then per
+    flush the new "review" lines followed by a "position" line (reviews
+    consumed from the panel and the fingerprint of the last one). Reviews
+    after the last position line belong to an interrupted flush; load()
+    cuts the file back to the last complete flush, so a crash mid-write
+    never corrupts the checkpoint and later flushes append to clean lines.
+
+    Only the position and the last RESUME_OVERLAP reviews (to match the
+    overlap re-read against) are held in memory; saved_reviews() streams
+    the rest back from disk, so memory stays flat however long the scroll.
+
+    Example:
+        checkpoint = ScrapeCheckpoint.for_place("f_data/checkpoints", place_key(url))
+        for review in place.iter_reviews(checkpoint=checkpoint):
+            ...
+    """
+
+    def __init__(
+        self, path: str, every_reviews: int = 200, every_seconds: float = 60.0
+    ):
+        self.path = path
+        self.every_reviews = every_reviews
+        self.every_seconds = every_seconds
+        self.scraped_at: Optional[datetime] = None
+        self.tail: Deque[dict] = deque(maxlen=RESUME_OVERLAP)
+        self.position = 0
+        self.last_fingerprint: Optional[str] = None
+        self._pending: List[dict] = []
+        self._flushed_position = 0
+        self._last_flush = time.monotonic()
+        self._resume_offset = 0
+        self.load()
+
+    @classmethod
+    def for_place(cls, directory: str, place: str, **kwargs) -> "ScrapeCheckpoint":
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r"[^0-9A-Za-z]+", "_", place).strip("_")
+        return cls(os.path.join(directory, f"{name}.jsonl"), **kwargs)
+
+    @property
+    def resumable(self) -> bool:
+        return self.position > 0
+
+    def load(self) -> None:
+        """Reads the last complete flush from disk, if the file exists."""
+        if not os.path.exists(self.path):
+            return
+        unconfirmed = []
+        confirmed_offset = 0  # End of the meta line or of the last position line
+        for entry, offset in iter_jsonl(self.path):
+            kind = entry.pop("type", None)
+            if kind == "meta":
+                self.scraped_at = datetime.fromisoformat(entry["scraped_at"])
+                confirmed_offset = offset
+            elif kind == "review":
+                unconfirmed.append(entry)
+            elif kind == "position":
+                self.tail.extend(unconfirmed)
+                unconfirmed = []
+                self.position = entry["count"]
+                self.last_fingerprint = entry["fingerprint"]
+                confirmed_offset = offset
+        # Drop a torn line and an interrupted flush's reviews before appending
+        truncate_jsonl(self.path, confirmed_offset)
+        self._resume_offset = confirmed_offset
+        self._flushed_position = self.position
+
+    def saved_reviews(self) -> Iterator[dict]:
+        """Streams the reviews of the loaded checkpoint back from disk, in order."""
+        for entry, offset in iter_jsonl(self.path):
+            if offset > self._resume_offset:
+                return
+            if entry.pop("type", None) == "review":
+                yield entry
+
+    def start(self, scraped_at: datetime) -> None:
+        """Begins a fresh checkpoint unless one is being resumed."""
+        if self.scraped_at is not None:
+            return
+        self.scraped_at = scraped_at
+        self._write([{"type": "meta", "scraped_at": scraped_at.isoformat()}], mode="w")
+
+    def record(
+        self, reviews: List[dict], position: int, fingerprint: Optional[str]
+    ) -> None:
+        """Adds reviews taken from the panel; flushes when an interval has passed."""
+        self.tail.extend(reviews)
+        self._pending.extend(reviews)
+        self.position = position
+        self.last_fingerprint = fingerprint
+        if (
+            len(self._pending) >= self.every_reviews
+            or time.monotonic() - self._last_flush >= self.every_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.position == self._flushed_position and not self._pending:
+            return
+        lines = [dict(review, type="review") for review in self._pending]
+        lines.append(
+            {
+                "type": "position",
+                "count": self.position,
+                "fingerprint": self.last_fingerprint,
+            }
+        )
+        self._write(lines)
+        self._pending = []
+        self._flushed_position = self.position
+        self._last_flush = time.monotonic()
+
+    def clear(self) -> None:
+        """Removes the checkpoint once the location finished cleanly."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _write(self, lines: List[dict], mode: str = "a") -> None:
+        append_jsonl(self.path, lines, mode=mode, fsync=True)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,295 @@
+import hashlib
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import List, Optional
+
+import pandas as pd
+
+from b_utils.jsonl import append_jsonl, has_torn_tail, iter_jsonl, repair_jsonl
+from b_utils.storage import read_table, write_table
+
+
+def slug(value: str) -> str:
+    """Partition-safe name: "5932 SE Federal Hwy" -> "5932_se_federal_hwy"."""
+    return re.sub(r"[^0-9a-z]+", "_", str(value).lower()).strip("_") or "unknown"
+
+
+def store_slug(address: str) -> str:
+    """Store partition name from a get_address() string, e.g.
+    "5932_se_federal_hwy_stuart_fl_34997". The whole address is used, since
+    the same street address exists in many cities."""
+    return slug(address) if address else "unknown"
+
+
+@dataclass(frozen=True)
+class PartitionEntry:
+    """One manifest line describing a partition file (or a file-less step such as a DB import).
+
+    Args:
+        layer: "raw", "processed", "final" or a bookkeeping layer like "imported"
+        business: Business slug, e.g. "starbucks"
+        store: Store slug, see store_slug()
+        scrape_date: YYYY-MM-DD the data was scraped
+        path: File path relative to the lake root ("" for file-less layers)
+        rows: Row count
+        min_review_date / max_review_date: Range of review_date, YYYY-MM-DD
+        sha256: Checksum of the file
+        source_sha256: Checksum of the partition this one was derived from
+        written_at: ISO timestamp of the write
+    """
+
+    layer: str
+    business: str
+    store: str
+    scrape_date: str
+    path: str = ""
+    rows: int = 0
+    min_review_date: Optional[str] = None
+    max_review_date: Optional[str] = None
+    sha256: str = ""
+    source_sha256: str = ""
+    written_at: str = ""
+
+    @property
+    def key(self) -> tuple:
+        return self.layer, self.business, self.store, self.scrape_date
+
+
+class DataLake:
+    """Partitioned layout for the raw / processed / final review data.
+
+    Files live under <root>/<layer>/business=<b>/store=<s>/scrape_date=<d>/,
+    Hive style, so pandas/pyarrow can also read a layer as one dataset.
+    _manifest.jsonl gets one PartitionEntry per write; the latest line for a
+    partition wins; a torn final line left by a crash is skipped and cut off
+    before the next append. Jobs select partitions from the manifest instead of
+    listing directories or knowing file names, and pending() gives just the
+    partitions a downstream layer has not caught up with.
+
+    Example:
+        lake = DataLake("f_data/lake")
+        for entry in lake.pending("raw", "processed"):
+            df = remove_emojis(lake.read_partition(entry), "review_content")
+            lake.write(df, "processed", entry.business, entry.store, entry.scrape_date, source=entry)
+    """
+
+    MANIFEST = "_manifest.jsonl"
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        repair_jsonl(self.manifest_path)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, self.MANIFEST)
+
+    def partition_dir(self, layer: str, business: str, store: str, scrape_date) -> str:
+        return os.path.join(
+            self.root,
+            layer,
+            f"business={slug(business)}",
+            f"store={slug(store)}",
+            f"scrape_date={_day(scrape_date)}",
+        )
+
+    def write(
+        self,
+        df: pd.DataFrame,
+        layer: str,
+        business: str,
+        store: str,
+        scrape_date,
+        fmt: str = "parquet",
+        source: Optional[PartitionEntry] = None,
+    ) -> PartitionEntry:
+        """Writes one partition (replacing any earlier write of it) and records it."""
+        path = os.path.join(
+            self.partition_dir(layer, business, store, scrape_date), f"part-0000.{fmt}"
+        )
+        write_table(df, path)
+        return self.register(
+            path, layer, business, store, scrape_date, source=source, df=df
+        )
+
+    def register(
+        self,
+        path: str,
+        layer: str,
+        business: str,
+        store: str,
+        scrape_date,
+        source: Optional[PartitionEntry] = None,
+        df: Optional[pd.DataFrame] = None,
+    ) -> PartitionEntry:
+        """Records a partition file written by someone else (e.g. save_to_csv()).
+
+        df, when given, is the frame that was written and spares reading it back.
+        """
+        if df is None:
+            df = read_table(path, columns=["review_date"])
+        dates = (
+            pd.to_datetime(df["review_date"], errors="coerce")
+            if "review_date" in df
+            else None
+        )
+        has_dates = dates is not None and dates.notna().any()
+        entry = PartitionEntry(
+            layer=layer,
+            business=slug(business),
+            store=slug(store),
+            scrape_date=_day(scrape_date),
+            path=os.path.relpath(path, self.root),
+            rows=len(df),
+            min_review_date=dates.min().strftime("%Y-%m-%d") if has_dates else None,
+            max_review_date=dates.max().strftime("%Y-%m-%d") if has_dates else None,
+            sha256=file_sha256(path),
+            source_sha256=source.sha256 if source else "",
+            written_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self._append(entry)
+        return entry
+
+    def record(self, layer: str, source: PartitionEntry, rows: int) -> PartitionEntry:
+        """Records a file-less step over a partition, e.g. layer="imported" after a DB load."""
+        entry = PartitionEntry(
+            layer=layer,
+            business=source.business,
+            store=source.store,
+            scrape_date=source.scrape_date,
+            rows=rows,
+            min_review_date=source.min_review_date,
+            max_review_date=source.max_review_date,
+            source_sha256=source.sha256,
+            written_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self._append(entry)
+        return entry
+
+    def partitions(
+        self,
+        layer: str,
+        business: Optional[str] = None,
+        store: Optional[str] = None,
+        since=None,
+        until=None,
+    ) -> List[PartitionEntry]:
+        """Latest manifest entry per partition of a layer, filtered by business,
+        store and scrape-date window [since, until], in scrape-date order."""
+        latest = {}
+        for entry in self._entries():
+            if entry.layer != layer:
+                continue
+            if business is not None and entry.business != slug(business):
+                continue
+            if store is not None and entry.store != slug(store):
+                continue
+            if since is not None and entry.scrape_date < _day(since):
+                continue
+            if until is not None and entry.scrape_date > _day(until):
+                continue
+            latest[entry.key] = entry
+        return sorted(
+            latest.values(), key=lambda e: (e.scrape_date, e.business, e.store)
+        )
+
+    def pending(
+        self, source_layer: str, target_layer: str, **filters
+    ) -> List[PartitionEntry]:
+        """Partitions of source_layer whose target_layer partition is missing or was
+        derived from an older version of them."""
+        done = {
+            (e.business, e.store, e.scrape_date): e.source_sha256
+            for e in self.partitions(target_layer, **filters)
+        }
+        return [
+            entry
+            for entry in self.partitions(source_layer, **filters)
+            if done.get((entry.business, entry.store, entry.scrape_date))
+            != entry.sha256
+        ]
+
+    def path(self, entry: PartitionEntry) -> str:
+        return os.path.join(self.root, entry.path)
+
+    def read_partition(
+        self, entry: PartitionEntry, columns: list = None, compact: bool = False
+    ) -> pd.DataFrame:
+        return read_table(self.path(entry), columns=columns, compact=compact)
+
+    def read(self, layer: str, columns: list = None, **filters) -> pd.DataFrame:
+        """Concatenates the selected partitions of a layer."""
+        frames = [
+            self.read_partition(e, columns) for e in self.partitions(layer, **filters)
+        ]
+        return (
+            pd.concat(frames, ignore_index=True)
+            if frames
+            else pd.DataFrame(columns=columns)
+        )
+
+    def verify(self, layer: Optional[str] = None) -> List[PartitionEntry]:
+        """Returns the partitions whose file is missing or no longer matches its checksum."""
+        layers = (
+            [layer] if layer else sorted({e.layer for e in self._entries() if e.path})
+        )
+        broken = []
+        for name in layers:
+            for entry in self.partitions(name):
+                if not entry.path:
+                    continue
+                path = self.path(entry)
+                if not os.path.exists(path) or file_sha256(path) != entry.sha256:
+                    broken.append(entry)
+        return broken
+
+    def _entries(self):
+        for entry, _ in iter_jsonl(self.manifest_path):
+            yield PartitionEntry(**entry)
+
+    def _append(self, entry: PartitionEntry) -> None:
+        with self._lock:
+            if has_torn_tail(self.manifest_path):
+                repair_jsonl(self.manifest_path)
+            append_jsonl(self.manifest_path, [asdict(entry)])
+
+
+LAKE_FILTERS = {
+    "business": "Only this business, e.g. 'STARBUCKS'",
+    "store": "Only this store partition, e.g. '5932_se_federal_hwy_stuart_fl_34997'",
+    "since": "Only partitions scraped on or after this date (YYYY-MM-DD)",
+    "until": "Only partitions scraped on or before this date (YYYY-MM-DD)",
+}
+
+
+def add_lake_filters(parser) -> None:
+    """Adds the DataLake.partitions() filters to an argparse parser."""
+    for name, help_text in LAKE_FILTERS.items():
+        parser.add_argument(f"--{name}", default=None, help=help_text)
+
+
+def lake_filters(args) -> dict:
+    """The add_lake_filters() options of parsed args, as partitions() kwargs."""
+    return {name: getattr(args, name) for name in LAKE_FILTERS}
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _day(value) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+if __name__ == "__main__":
+    pass
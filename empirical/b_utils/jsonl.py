@@ -0,0 +1,66 @@
+import json
+import os
+from typing import Iterable, Iterator, Tuple
+
+
+def iter_jsonl(path: str) -> Iterator[Tuple[dict, int]]:
+    """Yields (entry, offset just past its line) for each complete line of a
+    JSON-lines file, stopping at the first torn one (unterminated or not JSON),
+    which is what a crash mid-append leaves behind."""
+    if not os.path.exists(path):
+        return
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                return
+            offset += len(line)
+            yield entry, offset
+
+
+def truncate_jsonl(path: str, offset: int) -> None:
+    """Cuts the file back to offset, dropping a torn tail before anything is
+    appended after it."""
+    if os.path.exists(path) and os.path.getsize(path) > offset:
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+
+
+def repair_jsonl(path: str) -> int:
+    """Cuts the file back to its last complete line; returns that offset."""
+    good_offset = 0
+    for _, good_offset in iter_jsonl(path):
+        pass
+    truncate_jsonl(path, good_offset)
+    return good_offset
+
+
+def has_torn_tail(path: str) -> bool:
+    """Cheap check for an unterminated last line, e.g. from another process that
+    crashed mid-append since the file was last repaired."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def append_jsonl(
+    path: str, entries: Iterable[dict], mode: str = "a", fsync: bool = False
+) -> None:
+    """Writes entries as JSON lines in one write; fsync to survive a power cut."""
+    with open(path, mode, encoding="utf-8") as f:
+        f.write(
+            "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        )
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+if __name__ == "__main__":
+    pass
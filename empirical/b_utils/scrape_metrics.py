@@ -0,0 +1,208 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server
+
+# Own registry so importing the scraper inside Django never collides with the
+# web app's default-registry metrics
+SCRAPER_REGISTRY = CollectorRegistry()
+
+PHASE_SECONDS = Histogram(
+    "scraper_phase_duration_seconds",
+    "Wall-clock time of one scraper phase",
+    ["phase"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200),
+    registry=SCRAPER_REGISTRY,
+)
+PHASE_ERRORS = Counter(
+    "scraper_phase_errors_total",
+    "Exceptions raised out of a scraper phase",
+    ["phase", "error"],
+    registry=SCRAPER_REGISTRY,
+)
+SCROLL_ITERATIONS = Counter(
+    "scraper_scroll_iterations_total", "Review panel scrolls", registry=SCRAPER_REGISTRY
+)
+SPINNER_WAITS = Counter(
+    "scraper_spinner_waits_total",
+    "Scroll waits that ended with the loading spinner still showing",
+    registry=SCRAPER_REGISTRY,
+)
+SCROLL_WAIT_SECONDS = Counter(
+    "scraper_scroll_wait_seconds_total",
+    "Time spent waiting for reviews to load after a scroll",
+    registry=SCRAPER_REGISTRY,
+)
+BUTTONS_CLICKED = Counter(
+    "scraper_buttons_clicked_total",
+    '"See more" buttons expanded',
+    registry=SCRAPER_REGISTRY,
+)
+REVIEWS_EXTRACTED = Counter(
+    "scraper_reviews_extracted_total", "Reviews extracted", registry=SCRAPER_REGISTRY
+)
+LOCATIONS_SCRAPED = Counter(
+    "scraper_locations_scraped_total",
+    "Locations scraped and staged",
+    registry=SCRAPER_REGISTRY,
+)
+LOCATIONS_FAILED = Counter(
+    "scraper_locations_failed_total",
+    "Locations given up on after every retry",
+    registry=SCRAPER_REGISTRY,
+)
+
+_COUNTERS = {
+    "scroll_iterations": SCROLL_ITERATIONS,
+    "spinner_waits": SPINNER_WAITS,
+    "scroll_wait_seconds": SCROLL_WAIT_SECONDS,
+    "buttons_clicked": BUTTONS_CLICKED,
+    "reviews_extracted": REVIEWS_EXTRACTED,
+    "locations_scraped": LOCATIONS_SCRAPED,
+    "locations_failed": LOCATIONS_FAILED,
+}
+
+
+class RunMetrics:
+    """Per-run totals behind the JSON summary; Prometheus keeps the process totals.
+
+    Threads of one orchestrator run share the instance, so updates are locked.
+    """
+
+    def __init__(self, name: str = "scrape"):
+        self.name = name
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases = {}
+        self.errors = {}
+        self.counters = {key: 0 for key in _COUNTERS}
+
+    def observe(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases.setdefault(phase, []).append(seconds)
+
+    def error(self, phase: str, error: str) -> None:
+        with self._lock:
+            key = f"{phase}:{error}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def add(self, counter: str, amount: float) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+    def summary(self) -> dict:
+        with self._lock:
+            phases = {
+                phase: {
+                    "calls": len(samples),
+                    "total_s": round(sum(samples), 3),
+                    "mean_s": round(sum(samples) / len(samples), 3),
+                    "max_s": round(max(samples), 3),
+                }
+                for phase, samples in self.phases.items()
+            }
+            return {
+                "run": self.name,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "elapsed_s": round(time.perf_counter() - self._start, 3),
+                "phases": phases,
+                "counters": dict(self.counters),
+                "errors": dict(self.errors),
+            }
+
+    def write_json(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+_current_run: Optional[RunMetrics] = None
+
+
+def start_run(name: str = "scrape") -> RunMetrics:
+    """Makes a fresh RunMetrics the target of every phase and counter update."""
+    global _current_run
+    _current_run = RunMetrics(name)
+    return _current_run
+
+
+def current_run() -> Optional[RunMetrics]:
+    return _current_run
+
+
+def count(counter: str, amount: float = 1) -> None:
+    """Increments one of the scraper counters (see _COUNTERS) for Prometheus and the run."""
+    if amount <= 0:
+        return
+    _COUNTERS[counter].inc(amount)
+    if _current_run is not None:
+        _current_run.add(counter, amount)
+
+
+def _finish(phase: str, start: float, error: Optional[BaseException] = None) -> None:
+    elapsed = time.perf_counter() - start
+    PHASE_SECONDS.labels(phase).observe(elapsed)
+    if _current_run is not None:
+        _current_run.observe(phase, elapsed)
+    if error is not None:
+        PHASE_ERRORS.labels(phase, type(error).__name__).inc()
+        if _current_run is not None:
+            _current_run.error(phase, type(error).__name__)
+
+
+def timed_phase(phase: str):
+    """Decorator timing a scraper step into PHASE_SECONDS and counting its errors.
+
+    Generator functions are timed from the first next() until they are
+    exhausted or closed, i.e. over the whole stream.
+    """
+
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    yield from func(*args, **kwargs)
+                except GeneratorExit:
+                    _finish(phase, start)
+                    raise
+                except Exception as e:
+                    _finish(phase, start, e)
+                    raise
+                _finish(phase, start)
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                _finish(phase, start, e)
+                raise
+            _finish(phase, start)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def serve_metrics(port: int) -> None:
+    """Exposes SCRAPER_REGISTRY on http://0.0.0.0:<port>/metrics for Prometheus."""
+    start_http_server(port, registry=SCRAPER_REGISTRY)
+
+
+if __name__ == "__main__":
+    pass
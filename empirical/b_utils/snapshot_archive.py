@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from b_utils.jsonl import append_jsonl, has_torn_tail, iter_jsonl, repair_jsonl
+
+
+@dataclass(frozen=True)
+class SnapshotRecord:
+    """One index line: a place scraped at a moment, pointing at a stored blob.
+
+    Args:
+        place: Place key, e.g. the Maps feature id "0x88dedc...:0x9413..."
+        scraped_at: ISO timestamp of the scrape (the relative-date anchor)
+        sha256: Hex digest of the raw HTML; also the blob's file name
+        size: Raw HTML size in bytes
+        url: Page URL at capture time
+    """
+
+    place: str
+    scraped_at: str
+    sha256: str
+    size: int
+    url: str = ""
+
+
+class SnapshotArchive:
+    """Compressed, content-addressed store of raw review-panel HTML.
+
+    Blobs live under objects/<first two hex chars>/<sha256>.html.gz, so a page
+    captured twice with identical content is stored once. index.jsonl holds
+    one SnapshotRecord per capture (place + scrape time), appended in order,
+    and is all a reprocessing job needs to find and stream snapshots back.
+    A torn final index line (a crash mid-append) is skipped on read and cut
+    off before the next append.
+
+    Example:
+        archive = SnapshotArchive("f_data/snapshots")
+        archive.put(driver.page_source, place="0x88de...:0x9413...")
+        for record, page_html in archive.iter_snapshots(place="0x88de...:0x9413..."):
+            reviews = parse_review_dump(page_html)
+    """
+
+    INDEX = "index.jsonl"
+
+    def __init__(self, root: str, compresslevel: int = 6):
+        self.root = root
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        repair_jsonl(self.index_path)
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, self.INDEX)
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.html.gz")
+
+    def put(
+        self,
+        page_html: str,
+        place: str,
+        scraped_at: Optional[datetime] = None,
+        url: str = "",
+    ) -> SnapshotRecord:
+        """Stores a page (unless its content is already archived) and indexes it.
+
+        Args:
+            page_html: Raw HTML, normally driver.page_source
+            place: Place key the snapshot is filed under
+            scraped_at: Scrape time (default: now)
+            url: Page URL at capture time
+
+        Returns:
+            The SnapshotRecord appended to the index
+        """
+        data = page_html.encode("utf-8")
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write beside the blob and rename so readers never see half a file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                    fileobj=raw, mode="wb", compresslevel=self.compresslevel, mtime=0
+                ) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        record = SnapshotRecord(
+            place=place,
+            scraped_at=(scraped_at or datetime.now()).isoformat(timespec="seconds"),
+            sha256=sha256,
+            size=len(data),
+            url=url,
+        )
+        with self._lock:
+            if has_torn_tail(self.index_path):
+                repair_jsonl(self.index_path)
+            append_jsonl(self.index_path, [asdict(record)])
+        return record
+
+    def records(
+        self,
+        place: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[SnapshotRecord]:
+        """Streams index entries, optionally for one place and a scrape-time window."""
+        for entry, _ in iter_jsonl(self.index_path):
+            record = SnapshotRecord(**entry)
+            if place is not None and record.place != place:
+                continue
+            scraped_at = datetime.fromisoformat(record.scraped_at)
+            if since is not None and scraped_at < since:
+                continue
+            if until is not None and scraped_at >= until:
+                continue
+            yield record
+
+    def read(self, sha256: str) -> str:
+        """Returns the raw HTML of a stored blob."""
+        with gzip.open(self.blob_path(sha256), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def iter_snapshots(self, **filters) -> Iterator[Tuple[SnapshotRecord, str]]:
+        """Yields (record, page_html) per index entry; see records() for filters."""
+        for record in self.records(**filters):
+            yield record, self.read(record.sha256)
+
+    def stored_bytes(self) -> int:
+        """Compressed size of every blob on disk."""
+        total = 0
+        for folder, _, files in os.walk(os.path.join(self.root, "objects")):
+            total += sum(os.path.getsize(os.path.join(folder, name)) for name in files)
+        return total
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,252 @@
+import importlib.util
+import os
+from typing import Iterator
+
+import pandas as pd
+
+# Files with these extensions are Parquet; everything else is (optionally
+# compressed) CSV
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+# Low-cardinality text columns stored dictionary-encoded (one entry per store)
+CATEGORY_COLUMNS = ("business_address", "street", "city", "state", "zip")
+DATE_COLUMNS = ("review_date", "scraped_at")
+INTEGER_COLUMNS = (
+    "review_rating",
+    "food_rating",
+    "service_rating",
+    "atmosphere_rating",
+)
+# Free text and person names: mostly distinct values, kept as compact strings
+STRING_COLUMNS = (
+    "review_author",
+    "first_name",
+    "last_name",
+    "review_content",
+    "category_ratings",
+    "review_date_relative",
+)
+
+# PyArrow-backed strings store one buffer per column instead of one Python
+# object per cell
+STRING_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else "string"
+
+
+def is_parquet(path: str) -> bool:
+    return str(path).lower().endswith(PARQUET_EXTENSIONS)
+
+
+def read_table(path: str, columns: list = None, compact: bool = False) -> pd.DataFrame:
+    """Reads a staged data file, picking the format from its extension.
+
+    Args:
+        path: .parquet/.pq file, or a CSV (.csv, .csv.gz, .csv.zst ...)
+        columns: Only load these columns (Parquet skips the others on disk)
+        compact: Apply the compact_dtypes() profile and print the memory saved
+
+    Returns:
+        pd.DataFrame
+    """
+    if is_parquet(path):
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+    return compact_dtypes(df, label=os.path.basename(path)) if compact else df
+
+
+def iter_table(
+    path: str, chunksize: int, columns: list = None, compact: bool = False
+) -> Iterator[pd.DataFrame]:
+    """Streams a staged data file as DataFrames of at most chunksize rows, in file order.
+
+    Chunks keep a running RangeIndex, as if the file had been read whole.
+    With compact, each chunk gets the compact_dtypes() profile (quietly).
+    """
+    if compact:
+        for chunk in iter_table(path, chunksize, columns):
+            yield compact_dtypes(chunk)
+        return
+
+    if not is_parquet(path):
+        with pd.read_csv(path, usecols=columns, chunksize=chunksize) as reader:
+            yield from reader
+        return
+
+    import pyarrow.parquet as pq
+
+    start = 0
+    for batch in pq.ParquetFile(path).iter_batches(
+        batch_size=chunksize, columns=columns
+    ):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+class TableWriter:
+    """Appends DataFrame chunks to one CSV or Parquet file, published atomically on close.
+
+    Parquet chunks are typed like write_table() and cast to the first chunk's
+    schema, so every row group shares one schema.
+
+    Example:
+        with TableWriter("out.parquet") as writer:
+            for chunk in iter_table("in.csv", 100_000):
+                writer.write(transform(chunk))
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.rows = 0
+        self._parquet = is_parquet(path)
+        self._writer = None
+        self._schema = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self._parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(typed_columns(chunk), preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.tmp_path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+        else:
+            first = self._writer is None
+            # Compressed appends add a gzip member / zstd frame; readers handle both
+            chunk.to_csv(
+                self.tmp_path,
+                mode="w" if first else "a",
+                header=first,
+                index=False,
+                compression=_csv_compression(self.path),
+            )
+            self._writer = True
+        self.rows += len(chunk)
+
+    def close(self) -> str:
+        if self._parquet and self._writer is not None:
+            self._writer.close()
+        if self._writer is None:
+            raise ValueError(f"No chunks were written to {self.path}")
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        if self._parquet and self._writer is not None:
+            self._writer.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_table(df: pd.DataFrame, path: str) -> str:
+    """Writes a DataFrame without its index, as Parquet or CSV by extension.
+
+    Parquet output is typed first (see typed_columns()); CSV output is written
+    as is. The file appears under its final name only once complete.
+
+    Returns:
+        str: path
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        if is_parquet(path):
+            typed_columns(df).to_parquet(tmp_path, index=False)
+        else:
+            # The .tmp suffix hides the extension from pandas' compression inference
+            df.to_csv(tmp_path, index=False, compression=_csv_compression(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def typed_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Gives the known review columns real dtypes where no value would be lost.
+
+    Address fields become categoricals (dictionary-encoded in Parquet), dates
+    datetime64 and ratings (including any other *_rating column) nullable
+    Int8, or Int64 if a value does not fit. A column that does not convert
+    cleanly, e.g. a date still holding "3 weeks ago", is left as it is.
+    """
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            converted = pd.to_datetime(df[col], errors="coerce", format="ISO8601")
+            if converted.notna().sum() == (df[col].notna() & (df[col] != "")).sum():
+                df[col] = converted
+    ratings = [
+        c for c in df.columns if c in INTEGER_COLUMNS or str(c).endswith("_rating")
+    ]
+    for col in ratings:
+        converted = pd.to_numeric(df[col], errors="coerce")
+        if (
+            converted.notna().sum() == df[col].notna().sum()
+            and (converted.dropna() % 1 == 0).all()
+        ):
+            fits = converted.dropna().between(-128, 127).all()
+            df[col] = converted.astype("Int8" if fits else "Int64")
+    return df
+
+
+def compact_dtypes(df: pd.DataFrame, label: str = None) -> pd.DataFrame:
+    """The memory-compact dtype profile for review data at any stage.
+
+    typed_columns() (categorical addresses, datetime64 dates, Int8 ratings)
+    plus PyArrow-backed strings for names, content and the other free-text
+    columns. Missing values become pd.NA / NaT.
+
+    Args:
+        df: Reviews with default (object / int64 / float64) dtypes
+        label: Print the deep memory use before and after under this name
+
+    Returns:
+        pd.DataFrame: A converted copy
+    """
+    compact = typed_columns(df)
+    for col in STRING_COLUMNS:
+        if col in compact.columns and compact[col].dtype != STRING_DTYPE:
+            compact[col] = compact[col].astype(STRING_DTYPE)
+    if label:
+        before, after = memory_mb(df), memory_mb(compact)
+        saved = (1 - after / before) * 100 if before else 0.0
+        print(
+            f"{label}: {before:.2f} MB -> {after:.2f} MB in memory ({saved:.0f}% less)"
+        )
+    return compact
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    """Deep memory use of a DataFrame, strings included, in MB."""
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+def _csv_compression(path: str):
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,58 @@
+"""Address parts: extract_address_parts() per row vs split_addresses() with and without a cache.
+
+The business_address column repeats one address per store on every review;
+--stores distinct addresses are spread over --rows reviews.
+
+Usage:
+    python g_benchmarks/bench_address_parsing.py [--rows 1000000] [--stores 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.iv_data_final_processing import (
+    extract_address_parts,
+    open_address_cache,
+    split_addresses,
+)
+from g_benchmarks.fixtures import cycle_to
+from g_benchmarks.timing import timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--stores", type=int, default=500)
+    args = parser.parse_args()
+
+    stores = [
+        f"{100 + i} SE Federal Hwy, Stuart, FL {34000 + i:05d}"
+        for i in range(args.stores)
+    ]
+    addresses = pd.Series(cycle_to(stores, args.rows))
+
+    before, before_s = timed(
+        lambda column: column.apply(extract_address_parts), addresses
+    )
+    after, after_s = timed(split_addresses, addresses)
+    with tempfile.TemporaryDirectory() as directory:
+        cold, cold_s = timed(split_addresses, addresses, open_address_cache(directory))
+        warm, warm_s = timed(
+            split_addresses, addresses, open_address_cache(directory)
+        )  # A later run
+    assert after.equals(before) and cold.equals(before) and warm.equals(before)
+
+    print(f"{args.rows:,} reviews, {args.stores:,} stores")
+    print(f"per row apply          {before_s:8.3f}s")
+    print(f"factorize + map        {after_s:8.3f}s {before_s / after_s:7.1f}x")
+    print(f"  cache, first run     {cold_s:8.3f}s {before_s / cold_s:7.1f}x")
+    print(f"  cache, later run     {warm_s:8.3f}s {before_s / warm_s:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
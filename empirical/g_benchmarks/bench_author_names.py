@@ -0,0 +1,56 @@
+"""Author names: extract_first_last() per row + apply(pd.Series) vs split_author_names().
+
+Usage:
+    python g_benchmarks/bench_author_names.py [--rows 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode import iv_data_final_processing as stage_iv
+from a_sourceCode.iv_data_final_processing import extract_first_last, split_author_names
+from g_benchmarks.fixtures import review_values
+from g_benchmarks.timing import timed
+
+
+def authors_column(rows: int) -> pd.Series:
+    # Plus non-ASCII, single-token and empty names
+    return pd.Series(review_values(rows, "author", ("José  Núñez", "  cher ", "")))
+
+
+def per_row(authors: pd.Series) -> pd.DataFrame:
+    """The previous finalize_reviews() step."""
+    split = authors.apply(extract_first_last).apply(pd.Series)
+    split.columns = ["first_name", "last_name"]
+    return split
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>10} {'per row s':>10} {'pyarrow s':>10} {'str s':>8} {'speedup':>8}"
+    )
+    for rows in args.rows:
+        authors = authors_column(rows)
+        before, before_s = timed(per_row, authors)
+        after, after_s = timed(split_author_names, authors)
+        has_pyarrow, stage_iv._HAS_PYARROW = stage_iv._HAS_PYARROW, False
+        fallback, fallback_s = timed(split_author_names, authors)
+        stage_iv._HAS_PYARROW = has_pyarrow
+
+        assert after.equals(before) and fallback.equals(before)
+        print(
+            f"{rows:>10,} {before_s:>10.2f} {after_s:>10.2f} {fallback_s:>8.2f} "
+            f"{before_s / after_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Page-load time and browser memory per browser profile.
+
+Loads the replay server's place page (see replay_server.py) with each
+profile and reports the load time, how many sub-resources were fetched, the
+bytes transferred and the resident memory of every Chrome process. The
+default comparison is "headless" (nothing blocked) vs "lightweight"
+(headless, no images, small viewport, images/fonts/media blocked via CDP).
+
+Usage:
+    python g_benchmarks/bench_browser_profiles.py [--profiles headless lightweight]
+        [--reviews 1000] [--runs 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.browser_profile import get_profile
+from g_benchmarks.replay_server import ReplayServer
+
+LOAD_STATS_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+return {
+    load_ms: nav.loadEventEnd - nav.startTime,
+    resources: resources.length,
+    bytes: resources.reduce((total, r) => total + (r.transferSize || 0), nav.transferSize || 0),
+};
+"""
+
+
+def browser_rss_mb(driver) -> float:
+    """Resident memory of chromedriver's Chrome process tree, in MB."""
+    root = psutil.Process(driver.service.process.pid)
+    rss = 0
+    for process in root.children(recursive=True):
+        try:
+            rss += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+    return rss / 1024**2
+
+
+def bench_profile(name: str, url: str, runs: int) -> dict:
+    samples = {"load_ms": [], "resources": [], "bytes": [], "rss_mb": []}
+    for _ in range(runs):
+        with get_profile(name).create_driver() as driver:
+            driver.get(url)
+            stats = driver.execute_script(LOAD_STATS_JS)
+            for key in ("load_ms", "resources", "bytes"):
+                samples[key].append(stats[key])
+            samples["rss_mb"].append(browser_rss_mb(driver))
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=["headless", "lightweight"])
+    parser.add_argument("--reviews", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with ReplayServer() as server:
+        url = server.place_url(args.reviews)
+        results = {name: bench_profile(name, url, args.runs) for name in args.profiles}
+
+    print(f"{'profile':<14} {'load ms':>9} {'requests':>9} {'KB':>9} {'RSS MB':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<14} {r['load_ms']:>9.0f} {r['resources']:>9.0f} "
+            f"{r['bytes'] / 1024:>9.0f} {r['rss_mb']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
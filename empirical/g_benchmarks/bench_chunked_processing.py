@@ -0,0 +1,72 @@
+"""Peak memory and wall time of stages iii + iv in memory vs chunked.
+
+A raw file of --reviews synthetic reviews is written once, then run through
+preprocess_file() and finalize_file() whole and with each --chunksize. Peak
+memory is the tracemalloc high-water mark (Python and numpy allocations;
+Arrow's own buffers are not traced, so Parquet peaks read low),
+and every chunked output is checked against the in-memory one.
+
+Usage:
+    python g_benchmarks/bench_chunked_processing.py [--reviews 50000] [--chunksize 5000 20000]
+        [--format csv]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.ii_stage_data import save_to_csv
+from a_sourceCode.iii_data_pre_processing import preprocess_file
+from a_sourceCode.iv_data_final_processing import finalize_file
+from b_utils.storage import read_table
+from g_benchmarks.fixtures import ADDRESS, generate_reviews
+
+
+def run(raw: str, directory: str, fmt: str, chunksize) -> tuple:
+    name = chunksize or "whole"
+    processed = os.path.join(directory, f"processed_{name}.{fmt}")
+    final = os.path.join(directory, f"final_{name}.{fmt}")
+    tracemalloc.start()
+    start = time.perf_counter()
+    preprocess_file(raw, processed, chunksize)
+    finalize_file(processed, final, chunksize)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return final, seconds, peak / 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=50_000)
+    parser.add_argument("--chunksize", type=int, nargs="+", default=[5_000, 20_000])
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        raw = save_to_csv(
+            ADDRESS,
+            generate_reviews(args.reviews),
+            file_path=directory,
+            filename=f"raw.{args.format}",
+        )
+        print(f"{args.reviews:,} reviews, {args.format}")
+        print(f"{'chunksize':>10} {'seconds':>8} {'peak MB':>8}")
+
+        expected, seconds, peak = run(raw, directory, args.format, None)
+        print(f"{'whole':>10} {seconds:>8.2f} {peak:>8.1f}")
+        expected = read_table(expected)
+        for chunksize in args.chunksize:
+            final, seconds, peak = run(raw, directory, args.format, chunksize)
+            assert read_table(final).equals(
+                expected
+            ), f"chunksize={chunksize} output differs"
+            print(f"{chunksize:>10,} {seconds:>8.2f} {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""In-memory size of the raw, processed and final layers with default vs compact dtypes.
+
+Each committed sample under f_data/ is repeated --scale times, then measured
+as read_table() loads it by default and with the compact_dtypes() profile.
+
+Usage:
+    python g_benchmarks/bench_dtype_profile.py [--scale 500]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.storage import compact_dtypes, memory_mb
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "f_data"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=500)
+    args = parser.parse_args()
+
+    print(
+        f"{'layer':<10} {'rows':>9} {'default MB':>11} {'compact MB':>11} {'ratio':>6} {'convert s':>10}"
+    )
+    for layer in ("raw", "processed", "final"):
+        sample = glob.glob(os.path.join(DATA_DIR, layer, "*.csv"))[0]
+        df = pd.read_csv(sample)
+        df = df.drop(columns=[c for c in df.columns if c.startswith("Unnamed")])
+        df = pd.concat([df] * args.scale, ignore_index=True)
+
+        start = time.perf_counter()
+        compact = compact_dtypes(df)
+        seconds = time.perf_counter() - start
+        before, after = memory_mb(df), memory_mb(compact)
+        print(
+            f"{layer:<10} {len(df):>9,} {before:>11.1f} {after:>11.1f} "
+            f"{before / after:>5.1f}x {seconds:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Throughput (MB/s) of the archived-HTML review parsers.
+
+Writes a directory of saved review panels, then compares:
+    - parse_data_to_list()   the legacy str.find walker (text + stars only)
+    - parse_reviews_html()   one BeautifulSoup parse per document
+    - parse_review_dump()    one compiled-regex pass per document
+    - parse_review_dumps()   parse_review_dump() across worker processes
+
+Usage:
+    python g_benchmarks/bench_dump_parser.py [--files 40] [--reviews 1000] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.i_web_scraper import (
+    parse_data_to_list,
+    parse_review_dump,
+    parse_review_dumps,
+    parse_reviews_html,
+)
+from g_benchmarks.fixtures import load_fixture
+
+
+def sequential(parser, pages: list[str]) -> tuple[float, float]:
+    start = time.perf_counter()
+    for page in pages:
+        parser(page)
+    return (
+        time.perf_counter() - start,
+        sum(len(p.encode("utf-8")) for p in pages) / 1024**2,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--reviews", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    page = load_fixture(args.reviews)
+    anchor = datetime.now()
+    assert parse_review_dump(page, anchor) == parse_reviews_html(page, anchor)
+    megabytes = len(page.encode("utf-8")) * args.files / 1024**2
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(args.files):
+            with open(os.path.join(directory, f"dump_{i:04d}.html"), "w") as f:
+                f.write(page)
+        pages = [page] * args.files
+
+        timings = {
+            "parse_data_to_list": sequential(parse_data_to_list, pages),
+            # BeautifulSoup is ~50x slower; a few files are enough for its rate
+            "parse_reviews_html": sequential(parse_reviews_html, pages[:2]),
+            "parse_review_dump": sequential(parse_review_dump, pages),
+        }
+        start = time.perf_counter()
+        parsed = sum(
+            len(reviews)
+            for _, reviews in parse_review_dumps(directory, workers=args.workers)
+        )
+        timings[f"parse_review_dumps x{args.workers}"] = (
+            time.perf_counter() - start,
+            megabytes,
+        )
+        assert parsed == args.files * args.reviews
+
+    print(f"{args.files} files x {args.reviews} reviews = {megabytes:.1f} MB")
+    for name, (elapsed, size) in timings.items():
+        print(f"{name:<24} {elapsed:8.2f}s {size / elapsed:10.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Stage ii-iv wall time with intermediate CSVs vs the in-memory pipeline.
+
+The file path writes the raw CSV, reads it back for emoji cleaning, writes
+the processed CSV, reads it back for stage iv, writes the final CSV and reads
+it once more as import_reviews does. run_pipeline() does the same work on one
+DataFrame. Neither side loads the database.
+
+Usage:
+    python g_benchmarks/bench_pipeline.py [--reviews 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.ii_stage_data import save_to_csv
+from a_sourceCode.iii_data_pre_processing import csv_to_df, remove_emojis
+from a_sourceCode.iv_data_final_processing import finalize_reviews
+from a_sourceCode.vi_pipeline import run_pipeline
+from b_utils.storage import write_table
+from g_benchmarks.fixtures import ADDRESS, generate_reviews
+
+
+def file_round_trips(reviews: list, directory: str) -> float:
+    start = time.perf_counter()
+    raw = save_to_csv(ADDRESS, reviews, file_path=directory, filename="raw.csv")
+    processed = write_table(
+        remove_emojis(csv_to_df(raw), "review_content"),
+        os.path.join(directory, "processed.csv"),
+    )
+    final = write_table(
+        finalize_reviews(csv_to_df(processed)), os.path.join(directory, "final.csv")
+    )
+    pd.read_csv(final)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reviews", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    rows = []
+    for count in args.reviews:
+        reviews = generate_reviews(count)
+        with tempfile.TemporaryDirectory() as directory:
+            files_s = file_round_trips(reviews, directory)
+        start = time.perf_counter()
+        run_pipeline(ADDRESS, reviews, load=False)
+        rows.append((count, files_s, time.perf_counter() - start))
+
+    print(f"{'reviews':>8} {'with files s':>13} {'in memory s':>12} {'speedup':>8}")
+    for count, files_s, memory_s in rows:
+        print(
+            f"{count:>8} {files_s:>13.2f} {memory_s:>12.2f} {files_s / memory_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Per-row parse_relative_date() vs batch resolve_relative_dates().
+
+A scraped column holds millions of rows but only a few dozen distinct values
+("2 weeks ago", "a year ago" ...). The batch resolver parses each distinct
+string once against a single scrape timestamp and maps the result back.
+
+Usage:
+    python g_benchmarks/bench_relative_dates.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.i_web_scraper import (
+    _relative_delta,
+    parse_relative_date,
+    resolve_relative_dates,
+)
+from g_benchmarks.fixtures import RELATIVE_DATES
+from g_benchmarks.timing import timed
+
+
+def per_row(values: list, anchor: datetime) -> list:
+    return [parse_relative_date(value, anchor) for value in values]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    values = [rng.choice(RELATIVE_DATES) for _ in range(args.rows)]
+    series = pd.Series(values)
+    anchor = datetime.now()
+
+    _relative_delta.cache_clear()
+    expected, per_row_s = timed(per_row, values, anchor)
+    batch, batch_s = timed(resolve_relative_dates, values, anchor)
+    resolved, series_s = timed(resolve_relative_dates, series, anchor)
+    assert batch == expected and resolved.tolist() == expected
+
+    print(f"{args.rows:,} rows, {len(set(values))} distinct relative dates")
+    for name, elapsed in (
+        ("parse_relative_date per row", per_row_s),
+        ("resolve_relative_dates list", batch_s),
+        ("resolve_relative_dates Series", series_s),
+    ):
+        print(f"{name:<30} {elapsed:8.3f}s {per_row_s / elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
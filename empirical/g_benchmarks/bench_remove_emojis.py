@@ -0,0 +1,64 @@
+"""remove_emojis(): per-cell lambda (previous version) vs the vectorized column path.
+
+Usage:
+    python g_benchmarks/bench_remove_emojis.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode import iii_data_pre_processing as stage_iii
+from a_sourceCode.iii_data_pre_processing import (
+    _get_complete_emoji_regex,
+    remove_emojis,
+)
+from g_benchmarks.fixtures import review_values
+from g_benchmarks.timing import timed
+
+
+def remove_emojis_per_cell(df: pd.DataFrame, *target_cols: str) -> pd.DataFrame:
+    """The previous implementation: regex rebuilt, full copy, lambda per cell."""
+    all_emoji_regex = _get_complete_emoji_regex()
+    df_clean = df.copy()
+    for col in target_cols:
+        df_clean[col] = (
+            df_clean[col].astype(str).apply(lambda x: all_emoji_regex.sub("", x))
+        )
+    return df_clean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = pd.DataFrame(
+        {"review_content": review_values(args.rows, "content"), "review_rating": 5}
+    )
+    df.loc[::97, "review_content"] = None  # Reviews with a rating but no text
+
+    before, before_s = timed(remove_emojis_per_cell, df, "review_content")
+    after, after_s = timed(remove_emojis, df, "review_content")
+    has_pyarrow, stage_iii._HAS_PYARROW = stage_iii._HAS_PYARROW, False
+    fallback, fallback_s = timed(remove_emojis, df, "review_content")
+    stage_iii._HAS_PYARROW = has_pyarrow
+
+    text = df["review_content"].notna()
+    assert after["review_content"][text].equals(before["review_content"][text])
+    assert (
+        after["review_content"][~text].isna().all()
+    )  # per-cell wrote "None"/"nan" here
+    assert fallback["review_content"].equals(after["review_content"])
+
+    print(f"{args.rows:,} reviews")
+    print(f"per-cell lambda        {before_s:8.2f}s")
+    print(f"vectorized (pyarrow)   {after_s:8.2f}s {before_s / after_s:6.1f}x")
+    print(f"vectorized (str.replace) {fallback_s:6.2f}s {before_s / fallback_s:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Per-review vs batch review extraction against saved review-panel fixtures.
+
+Usage:
+    python g_benchmarks/bench_review_extraction.py [--counts 100 1000] [--browser]
+
+Without --browser only the parsing side is measured: the per-review path
+re-parses each card's outerHTML the way get_reviews() does and adds the
+fixed 0.3 s scroll sleep it pays per review as a modelled cost. With
+--browser the fixtures are opened in headless Chrome and every get_reviews()
+mode is timed end to end.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.i_web_scraper import (
+    HTML_PARSER,
+    _review_from_soup,
+    get_reviews,
+    parse_reviews_html,
+    resolve_review_dates,
+)
+from g_benchmarks.fixtures import fixture_path, load_fixture
+from g_benchmarks.timing import timed
+
+PER_REVIEW_SLEEP = 0.3
+
+
+def per_review_extract(page_html: str, anchor: datetime) -> list[dict]:
+    """Replays get_reviews(mode="per_review") parsing without a browser."""
+    cards = BeautifulSoup(page_html, HTML_PARSER).select("div.jftiEf")
+    return resolve_review_dates(
+        [_review_from_soup(BeautifulSoup(str(card), "html.parser")) for card in cards],
+        anchor,
+    )
+
+
+def bench_offline(count: int) -> None:
+    page_html = load_fixture(count)
+    anchor = datetime.now()
+    per_review, per_review_s = timed(per_review_extract, page_html, anchor)
+    batch, batch_s = timed(parse_reviews_html, page_html, anchor)
+    assert per_review == batch, "per-review and batch extraction disagree"
+
+    modelled = per_review_s + PER_REVIEW_SLEEP * count
+    print(
+        f"{count:>6} reviews | per-review parse {per_review_s:8.3f}s "
+        f"(+{PER_REVIEW_SLEEP * count:.0f}s sleeps = {modelled:8.1f}s) | "
+        f"batch parse {batch_s:6.3f}s | speedup {modelled / batch_s:,.0f}x"
+    )
+
+
+def bench_browser(count: int) -> None:
+    from selenium import webdriver
+
+    load_fixture(count)
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    with webdriver.Chrome(options=options) as driver:
+        driver.get(f"file://{fixture_path(count)}")
+        results = {}
+        anchor = datetime.now()
+        for mode in ("per_review", "script", "page_source"):
+            results[mode], elapsed = timed(
+                get_reviews, driver, mode=mode, anchor=anchor
+            )
+            print(f"{count:>6} reviews | browser {mode:<11} {elapsed:8.2f}s")
+        assert results["per_review"] == results["script"] == results["page_source"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--browser", action="store_true")
+    args = parser.parse_args()
+
+    for count in args.counts:
+        bench_offline(count)
+        if args.browser:
+            bench_browser(count)
+
+
+if __name__ == "__main__":
+    main()
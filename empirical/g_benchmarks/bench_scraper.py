@@ -0,0 +1,100 @@
+"""Wall-clock and WebDriver round-trip benchmark of the scraper steps.
+
+Runs verify_url, get_address, expand_all_reviews and get_reviews against the
+local replay server (see replay_server.py) at 100, 1,000 and 10,000 reviews,
+so every scraper change gets a repeatable number without touching Google.
+
+Usage:
+    python g_benchmarks/bench_scraper.py [--counts 100 1000 10000]
+        [--mode script] [--delay 300] [--headed]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from selenium import webdriver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.i_web_scraper import (
+    expand_all_reviews,
+    get_address,
+    get_reviews,
+    verify_url,
+)
+from g_benchmarks.replay_server import PAGE_SIZE, ReplayServer
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands sent over the wire by one driver.
+
+    WebElement calls go through their parent driver's execute(), so patching
+    the instance attribute catches element round trips as well.
+    """
+
+    def __init__(self, driver):
+        self.count = 0
+        self._execute = driver.execute
+        driver.execute = self._counted
+
+    def _counted(self, *args, **kwargs):
+        self.count += 1
+        return self._execute(*args, **kwargs)
+
+
+def measure(counter: RoundTripCounter, func, *args, **kwargs):
+    before = counter.count
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start, counter.count - before
+
+
+def bench(server: ReplayServer, count: int, mode: str, headless: bool) -> list:
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    url, expected_url = server.place_url(count), server.expected_url
+    max_attempts = count // PAGE_SIZE + 10
+
+    rows = []
+    with webdriver.Chrome(options=options) as driver:
+        counter = RoundTripCounter(driver)
+        steps = [
+            ("verify_url", verify_url, (driver, url, expected_url), {}),
+            ("get_address", get_address, (driver, url, expected_url), {}),
+            (
+                "expand_all_reviews",
+                expand_all_reviews,
+                (driver, url, expected_url),
+                {"max_attempts": max_attempts},
+            ),
+            ("get_reviews", get_reviews, (driver,), {"mode": mode}),
+        ]
+        for name, func, args, kwargs in steps:
+            result, elapsed, trips = measure(counter, func, *args, **kwargs)
+            rows.append((count, name, elapsed, trips))
+        assert len(result) == count, f"expected {count} reviews, got {len(result)}"
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--mode", default="script", help="get_reviews() mode")
+    parser.add_argument("--delay", type=int, default=300, help="Spinner delay in ms")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    with ReplayServer(delay_ms=args.delay) as server:
+        for count in args.counts:
+            rows.extend(bench(server, count, args.mode, not args.headed))
+
+    print(f"{'reviews':>8} {'step':<20} {'seconds':>10} {'round trips':>12}")
+    for count, name, elapsed, trips in rows:
+        print(f"{count:>8} {name:<20} {elapsed:>10.2f} {trips:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Size and re-parse time of a month of archived review-panel snapshots.
+
+Simulates daily scrapes of several places whose panels only change when new
+reviews arrive (weekly here), archives every capture in a SnapshotArchive and
+reports raw vs stored bytes, then streams the whole month back through
+parse_review_dump() via reparse_snapshots().
+
+Usage:
+    python g_benchmarks/bench_snapshot_archive.py [--places 20] [--days 30]
+        [--reviews 1000] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.i_web_scraper import reparse_snapshots
+from b_utils.snapshot_archive import SnapshotArchive
+from g_benchmarks.fixtures import generate_reviews, render_review_panel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--reviews", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    first_day = datetime(2025, 6, 1, 9)
+    with tempfile.TemporaryDirectory() as root:
+        archive = SnapshotArchive(root)
+        raw_bytes = 0
+        start = time.perf_counter()
+        for place in range(args.places):
+            pages = {}
+            for day in range(args.days):
+                week = day // 7
+                if week not in pages:
+                    pages[week] = render_review_panel(
+                        generate_reviews(args.reviews, seed=place * 1000 + week)
+                    )
+                record = archive.put(
+                    pages[week], f"place-{place}", first_day + timedelta(days=day)
+                )
+                raw_bytes += record.size
+        archive_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = sum(
+            len(reviews) for _, reviews in reparse_snapshots(archive, args.workers)
+        )
+        reparse_s = time.perf_counter() - start
+        assert parsed == args.places * args.days * args.reviews
+        stored = archive.stored_bytes()
+
+    snapshots = args.places * args.days
+    print(
+        f"{snapshots} snapshots ({args.places} places x {args.days} days, {args.reviews} reviews)"
+    )
+    print(f"raw HTML        {raw_bytes / 1024**2:10.2f} MB")
+    print(
+        f"archived        {stored / 1024**2:10.2f} MB ({raw_bytes / stored:.0f}x smaller)"
+    )
+    print(f"archive writes  {archive_s:10.2f}s")
+    print(
+        f"re-parse x{args.workers:<4} {reparse_s:10.2f}s ({parsed / reparse_s:,.0f} reviews/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
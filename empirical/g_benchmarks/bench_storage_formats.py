@@ -0,0 +1,70 @@
+"""Read time and file size of the raw, processed and final layers as CSV vs Parquet.
+
+Each committed sample under f_data/ is repeated --scale times (a sweep of
+many locations), then written as the current indexed CSV, as a plain CSV via
+write_table() and as typed Parquet via write_table(), and read back with
+read_table(). Repeated samples dictionary-encode far better than a real
+sweep would, so treat the Parquet size as a lower bound; read times hold.
+
+Usage:
+    python g_benchmarks/bench_storage_formats.py [--scale 500] [--runs 3]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from b_utils.storage import read_table, write_table
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "f_data"
+)
+
+
+def median_read_s(path: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        read_table(path)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'layer':<10} {'format':<14} {'rows':>9} {'MB':>9} {'read s':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for layer in ("raw", "processed", "final"):
+            sample = glob.glob(os.path.join(DATA_DIR, layer, "*.csv"))[0]
+            df = pd.read_csv(sample)
+            df = df.drop(columns=[c for c in df.columns if c.startswith("Unnamed")])
+            df = pd.concat([df] * args.scale, ignore_index=True)
+
+            paths = {"csv (indexed)": os.path.join(directory, f"{layer}_indexed.csv")}
+            df.to_csv(paths["csv (indexed)"])  # How stages iii/iv wrote it before
+            paths["csv"] = write_table(df, os.path.join(directory, f"{layer}.csv"))
+            paths["parquet"] = write_table(
+                df, os.path.join(directory, f"{layer}.parquet")
+            )
+
+            for name, path in paths.items():
+                size = os.path.getsize(path) / 1024**2
+                print(
+                    f"{layer:<10} {name:<14} {len(df):>9,} {size:>9.2f} "
+                    f"{median_read_s(path, args.runs):>8.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
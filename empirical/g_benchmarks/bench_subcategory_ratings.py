@@ -0,0 +1,47 @@
+"""Subcategory ratings: per-row parse_subcategory_ratings() vs extract_subcategory_ratings().
+
+Usage:
+    python g_benchmarks/bench_subcategory_ratings.py [--rows 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from a_sourceCode.iv_data_final_processing import (
+    extract_subcategory_ratings,
+    parse_subcategory_ratings,
+)
+from g_benchmarks.fixtures import review_values
+from g_benchmarks.timing import timed
+
+
+def ratings_column(rows: int) -> pd.Series:
+    return pd.Series(
+        review_values(rows, lambda r: " | ".join(r["category_ratings"]) or None)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'apply s':>9} {'vectorized s':>13} {'speedup':>8}")
+    for rows in args.rows:
+        column = ratings_column(rows)
+        before, before_s = timed(
+            lambda c: c.apply(parse_subcategory_ratings).astype("Int64"), column
+        )
+        after, after_s = timed(extract_subcategory_ratings, column)
+        assert after.equals(before)
+        print(
+            f"{rows:>10,} {before_s:>9.2f} {after_s:>13.2f} {before_s / after_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
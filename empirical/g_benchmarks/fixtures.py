@@ -0,0 +1,213 @@
+import html
+import os
+import random
+import tempfile
+from typing import List
+
+# Directory holding the saved review-panel pages used by the benchmarks
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Other sizes are rendered on demand here, outside the source tree
+GENERATED_FIXTURE_DIR = os.path.join(tempfile.gettempdir(), "review_panel_fixtures")
+
+FIRST_NAMES = [
+    "nishant",
+    "Amber",
+    "Taylor",
+    "Brook",
+    "Caden",
+    "Maria",
+    "José",
+    "Li",
+    "Kwame",
+    "Olivia",
+    "Noah",
+    "Emma",
+    "Liam",
+    "Ava",
+    "Sofia",
+    "Mateo",
+]
+LAST_NAMES = [
+    "narula",
+    "Maire",
+    "Stanakis",
+    "Smith",
+    "Garcia",
+    "Nguyen",
+    "Okafor",
+    "Johnson",
+    "Brown",
+    "Lopez",
+    "Kim",
+    "Patel",
+    "Rossi",
+    "Müller",
+]
+RELATIVE_DATES = [
+    "a day ago",
+    "2 days ago",
+    "6 days ago",
+    "a week ago",
+    "3 weeks ago",
+    "a month ago",
+    "4 months ago",
+    "11 months ago",
+    "a year ago",
+    "3 years ago",
+]
+SENTENCES = [
+    "The staff at this location always impress me.",
+    "Drive-through line was slow but the coffee was hot.",
+    "Mobile order was ready before I even parked 👍",
+    "They got my order wrong twice this week.",
+    "Great spot to relax before continuing a long drive ☕️",
+    "Clean tables, friendly baristas and plenty of outlets.",
+    "Waited about 16 minutes for one sandwich.",
+    "Best cold brew in town, hands down 😍",
+]
+SUBCATEGORIES = ["Food", "Service", "Atmosphere"]
+ADDRESS = "5932 SE Federal Hwy, Stuart, FL 34997"
+
+
+def generate_reviews(count: int, seed: int = 7) -> List[dict]:
+    """Builds deterministic review records shaped like get_reviews() output.
+
+    Args:
+        count: Number of reviews to generate
+        seed: Random seed so every run renders the same corpus
+
+    Returns:
+        List of review dicts with the raw relative date string in "date"
+    """
+    rng = random.Random(seed)
+    reviews = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            author = rng.choice(FIRST_NAMES)
+        else:
+            author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        content = (
+            " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 6)))
+            if rng.random() > 0.08
+            else None
+        )
+        category_ratings = [
+            f"{name}:{rng.randint(1, 5)}"
+            for name in SUBCATEGORIES
+            if rng.random() > 0.4
+        ]
+        reviews.append(
+            {
+                "author": author,
+                "overall_stars": rng.randint(1, 5),
+                "date": rng.choice(RELATIVE_DATES),
+                "content": content,
+                "category_ratings": category_ratings,
+            }
+        )
+    return reviews
+
+
+def cycle_to(values: list, rows: int) -> list:
+    """values repeated until there are exactly rows of them."""
+    return (values * (rows // len(values) + 1))[:rows]
+
+
+def review_values(rows: int, field, extra: tuple = ()) -> list:
+    """rows values of one review field for a benchmark column.
+
+    Only min(rows, 20000) reviews are generated (plus any extra values) and
+    cycled, which keeps million-row columns quick to build.
+
+    Args:
+        rows: Length of the column
+        field: Review key, or a function of the review dict
+        extra: Edge-case values appended before cycling
+    """
+    get = field if callable(field) else (lambda review: review[field])
+    values = [get(review) for review in generate_reviews(min(rows, 20000))]
+    return cycle_to(values + list(extra), rows)
+
+
+def render_review(review: dict, index: int) -> str:
+    """Renders one review using the Google Maps review-card markup."""
+    stars = "".join(
+        (
+            '<span class="hCCjke google-symbols NhBTye elGi1d" aria-hidden="true"></span>'
+            if i < review["overall_stars"]
+            else '<span class="hCCjke google-symbols NhBTye" aria-hidden="true"></span>'
+        )
+        for i in range(5)
+    )
+    content = ""
+    if review["content"] is not None:
+        content = (
+            f'<div class="MyEned" lang="en"><span class="wiI7pd">'
+            f'{html.escape(review["content"])}</span>'
+            f'<button class="w8nwRe kyuRq" aria-label="See more" '
+            f'aria-expanded="false">More</button></div>'
+        )
+    ratings = "".join(
+        f'<div class="PBK6be"><span class="RfDO5c">'
+        f'<span style="font-weight: bold;">{name}:</span> {value}</span></div>'
+        for name, value in (r.split(":") for r in review["category_ratings"])
+    )
+    return (
+        f'<div class="jftiEf fontBodyMedium" data-review-id="r{index:06d}" '
+        f'aria-label="{html.escape(review["author"])}">'
+        f'<div class="jJc9Ad"><div class="WNxzHc qLhwHc"><button class="al6Kxe">'
+        f'<div class="d4r55">{html.escape(review["author"])}</div>'
+        f'<div class="RfnDt">Local Guide · {index % 90 + 1} reviews</div>'
+        f"</button></div>"
+        f'<div class="DU9Pgb"><span aria-label="{review["overall_stars"]} stars" '
+        f'class="kvMYJc" role="img">{stars}</span>'
+        f'<span class="rsqaWe">{review["date"]}</span></div>'
+        f"{content}{ratings}</div></div>"
+    )
+
+
+def render_review_panel(reviews: List[dict], address: str = ADDRESS) -> str:
+    """Renders a saved place page with every review already loaded."""
+    cards = "\n".join(render_review(review, i) for i, review in enumerate(reviews))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        "<title>Starbucks - Google Maps</title></head><body>"
+        f'<button aria-label="Address: {html.escape(address)}">'
+        f'<div class="Io6YTe">{html.escape(address)}</div></button>'
+        '<div class="m6QErb DxyBCb kA9KIf dS8AEf" style="height:600px;overflow-y:scroll">'
+        f'<div class="m6QErb">\n{cards}\n</div></div></body></html>'
+    )
+
+
+def fixture_path(count: int) -> str:
+    """The committed page for `count` reviews if there is one, else its generated copy."""
+    name = f"review_panel_{count}.html"
+    committed = os.path.join(FIXTURE_DIR, name)
+    return (
+        committed
+        if os.path.exists(committed)
+        else os.path.join(GENERATED_FIXTURE_DIR, name)
+    )
+
+
+def load_fixture(count: int) -> str:
+    """Returns the saved review panel for `count` reviews, rendering it if missing."""
+    path = fixture_path(count)
+    if not os.path.exists(path):
+        write_fixture(count, directory=GENERATED_FIXTURE_DIR)
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def write_fixture(count: int, seed: int = 7, directory: str = FIXTURE_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"review_panel_{count}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_review_panel(generate_reviews(count, seed)))
+    return path
+
+
+if __name__ == "__main__":
+    # Only the 100-review page is committed; larger ones stay out of the tree
+    print(f"Wrote {write_fixture(100)}")
+    print(f"Wrote {write_fixture(1000, directory=GENERATED_FIXTURE_DIR)}")
@@ -0,0 +1,237 @@
+"""Local stand-in for a Google Maps place page, for offline scraper runs.
+
+Serves a place page with the same selectors the scraper relies on (Overview,
+Reviews and Address buttons, the div.m6QErb reviews panel, Sort menu and
+"See more" buttons). Reviews come from the deterministic fixture corpus and
+are lazy-loaded a page at a time when the panel is scrolled to the bottom,
+with the Loading... spinner shown for a configurable delay. Map tiles,
+photos and a web font are served as filler so request blocking can be
+measured too.
+
+Usage:
+    python g_benchmarks/replay_server.py --port 8765
+    # then open http://127.0.0.1:8765/maps/place/Starbucks/?reviews=1000
+"""
+
+import argparse
+import functools
+import html
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from g_benchmarks.fixtures import (
+    ADDRESS,
+    RELATIVE_DATES,
+    generate_reviews,
+    render_review,
+)
+
+PAGE_SIZE = 10
+TILE_BYTES = 64 * 1024
+PHOTO_BYTES = 256 * 1024
+
+PLACE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Starbucks - Google Maps</title>
+<style>
+@font-face {{ font-family: "Google Sans"; src: url("/fonts/google-sans.woff2"); }}
+body {{ font-family: "Google Sans", sans-serif; }}
+.tiles img {{ width: 128px; height: 128px; }}
+.photos img {{ width: 200px; height: 150px; }}
+</style></head><body>
+<div class="tiles">{tiles}</div>
+<div class="photos">{photos}</div>
+<button aria-label="Overview">Overview</button>
+<button aria-label="Reviews for Starbucks">Reviews</button>
+<button aria-label="Address: {address}"><div class="Io6YTe">{address}</div></button>
+<div class="m6QErb DxyBCb kA9KIf dS8AEf" style="height:600px;overflow-y:scroll">
+  <button aria-label="Sort reviews">Sort</button>
+  <div id="sort-menu" hidden>
+    <div role="menuitemradio" data-index="0">Most relevant</div>
+    <div role="menuitemradio" data-index="1">Newest</div>
+  </div>
+  <div class="m6QErb" id="review-list"></div>
+</div>
+<script>
+const total = {count}, pageSize = {page_size}, delay = {delay};
+const panel = document.querySelector("div.dS8AEf");
+const list = document.getElementById("review-list");
+const menu = document.getElementById("sort-menu");
+let order = "relevant", loading = false, generation = 0;
+
+async function loadPage() {{
+    const loaded = list.querySelectorAll("div.jftiEf").length;
+    if (loading || loaded >= total) return;
+    loading = true;
+    const mine = generation;
+    const spinner = document.createElement("div");
+    spinner.setAttribute("aria-label", "Loading...");
+    panel.appendChild(spinner);
+    const response = await fetch(
+        `/reviews?count=${{total}}&offset=${{loaded}}&limit=${{pageSize}}&order=${{order}}`
+    );
+    const cards = await response.text();
+    await new Promise((resolve) => setTimeout(resolve, delay));
+    if (mine === generation) list.insertAdjacentHTML("beforeend", cards);
+    spinner.remove();
+    loading = false;
+}}
+
+panel.addEventListener("scroll", () => {{
+    if (panel.scrollTop + panel.clientHeight >= panel.scrollHeight - 50) loadPage();
+}});
+document.querySelector('button[aria-label^="Reviews"]').addEventListener("click", () => {{
+    if (!list.querySelector("div.jftiEf")) loadPage();
+}});
+document.querySelector('button[aria-label="Sort reviews"]').addEventListener("click", () => {{
+    menu.hidden = false;
+}});
+menu.addEventListener("click", (event) => {{
+    const item = event.target.closest('[role="menuitemradio"]');
+    if (!item) return;
+    order = item.dataset.index === "1" ? "newest" : "relevant";
+    menu.hidden = true;
+    generation += 1;
+    loading = false;
+    list.innerHTML = "";
+    loadPage();
+}});
+document.addEventListener("click", (event) => {{
+    if (event.target.matches('button[aria-label^="See more"]')) event.target.remove();
+}});
+</script></body></html>
+"""
+
+
+@functools.lru_cache(maxsize=8)
+def corpus(count: int, order: str = "relevant") -> tuple:
+    reviews = generate_reviews(count)
+    if order == "newest":
+        reviews = sorted(reviews, key=lambda r: RELATIVE_DATES.index(r["date"]))
+    return tuple(reviews)
+
+
+def render_place_page(count: int, delay_ms: int) -> str:
+    tiles = "".join(
+        f'<img src="/maps/vt?x={x}&y={y}">' for x in range(4) for y in range(3)
+    )
+    photos = "".join(f'<img src="/photos/{i}.jpg">' for i in range(8))
+    return PLACE_PAGE.format(
+        tiles=tiles,
+        photos=photos,
+        address=html.escape(ADDRESS),
+        count=count,
+        page_size=PAGE_SIZE,
+        delay=delay_ms,
+    )
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    # Set by ReplayServer
+    default_delay_ms = 300
+    asset_delay = 0.02
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+        if parts.path.startswith("/maps/place/"):
+            body = render_place_page(
+                int(query.get("reviews", 100)),
+                int(query.get("delay", self.default_delay_ms)),
+            )
+            self._send(body.encode("utf-8"), "text/html; charset=utf-8")
+        elif parts.path == "/reviews":
+            offset = int(query.get("offset", 0))
+            limit = int(query.get("limit", PAGE_SIZE))
+            reviews = corpus(
+                int(query.get("count", 100)), query.get("order", "relevant")
+            )
+            cards = "".join(
+                render_review(review, offset + i)
+                for i, review in enumerate(reviews[offset : offset + limit])
+            )
+            self._send(cards.encode("utf-8"), "text/html; charset=utf-8")
+        elif parts.path == "/maps/vt":
+            time.sleep(self.asset_delay)
+            self._send(b"\x89PNG" + b"\0" * TILE_BYTES, "image/png")
+        elif parts.path.startswith("/photos/"):
+            time.sleep(self.asset_delay)
+            self._send(b"\xff\xd8\xff" + b"\0" * PHOTO_BYTES, "image/jpeg")
+        elif parts.path.startswith("/fonts/"):
+            time.sleep(self.asset_delay)
+            self._send(b"wOF2" + b"\0" * TILE_BYTES, "font/woff2")
+        else:
+            self.send_error(404)
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """Runs the replay site on a background thread.
+
+    Example:
+        with ReplayServer() as server:
+            verify_url(driver, server.place_url(1000), server.expected_url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay_ms: int = 300):
+        handler = type("Handler", (ReplayHandler,), {"default_delay_ms": delay_ms})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def expected_url(self) -> str:
+        return f"{self.host}:{self.port}/maps/place/Starbucks"
+
+    def place_url(self, reviews: int, delay_ms: int = None) -> str:
+        url = f"http://{self.expected_url}/?reviews={reviews}"
+        return url if delay_ms is None else f"{url}&delay={delay_ms}"
+
+    def start(self) -> "ReplayServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=int, default=300, help="Spinner delay in ms")
+    args = parser.parse_args()
+
+    with ReplayServer(port=args.port, delay_ms=args.delay) as server:
+        print(f"Serving {server.place_url(1000)}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
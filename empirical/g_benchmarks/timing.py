@@ -0,0 +1,8 @@
+import time
+
+
+def timed(func, *args, **kwargs) -> tuple:
+    """Calls func once; returns (result, seconds taken)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -11,6 +11,8 @@ import pytz
 # goes to i_app
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 sys.path.append(str(BASE_DIR))
+# empirical/ (or /app in the container), for b_utils
+sys.path.append(str(BASE_DIR.parent))
 
 # from b_utils.logger import Logger
 # from b_utils.helper import get_directory_name
@@ -35,6 +37,10 @@ class Command(BaseCommand):
             --business_name "STARBUCKS" \
             --source "GOOGLE_MAPS"
 
+        # Only the final data-lake partitions not imported yet
+        python manage.py import_reviews /path/to/f_data/lake --lake \
+            --business_name "STARBUCKS" --source "GOOGLE_MAPS" --since 2025-06-01
+
     File format expected:
         review_date, review_rating, review_content, first_name, last_name, street, city, state, zip, category_ratings
     """
@@ -74,7 +80,7 @@ class Command(BaseCommand):
         parser.add_argument(
             "file_path",
             type=str,
-            help="Path to the processed CSV file",
+            help="Path to the processed CSV or Parquet file",
         )
         parser.add_argument(
             "--business_name",
@@ -88,11 +94,35 @@ class Command(BaseCommand):
             required=True,
             help="Source of the scraped data (ex: 'GOOGLE MAPS)",
         )
+        parser.add_argument(
+            "--lake",
+            action="store_true",
+            help="file_path is a data lake root; import its pending final partitions",
+        )
+        parser.add_argument(
+            "--store",
+            type=str,
+            default=None,
+            help="With --lake: only this store partition (ex: '5932_se_federal_hwy_stuart_fl_34997')",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            default=None,
+            help="With --lake: only partitions scraped on or after this date (YYYY-MM-DD)",
+        )
 
     def handle(self, *args, **options):
+        if options["lake"]:
+            self.import_lake(options)
+            return
+
         # Load and prepare the DataFrame
         try:
-            df = pd.read_csv(options["file_path"])
+            from b_utils.storage import read_table
+
+            # Compact dtypes while loaded; plain Python values for the model
+            df = self.plain_values(read_table(options["file_path"], compact=True))
             df.sort_values(by="review_date", ascending=False, inplace=True)
             self.import_data(
                 df,
@@ -106,6 +136,42 @@ class Command(BaseCommand):
                 )
             )
 
+    def import_lake(self, options):
+        """Imports each final partition once; re-imports it only if it was rewritten."""
+        from b_utils.data_lake import DataLake
+
+        lake = DataLake(options["file_path"])
+        pending = lake.pending(
+            "final",
+            "imported",
+            business=options["business_name"],
+            store=options["store"],
+            since=options["since"],
+        )
+        self.stdout.write(f"{len(pending)} partitions to import")
+        for entry in pending:
+            df = self.plain_values(lake.read_partition(entry, compact=True))
+            df.sort_values(by="review_date", ascending=False, inplace=True)
+            imported = self.import_data(
+                df, business_name=options["business_name"], source=options["source"]
+            )
+            if imported or df.empty:
+                lake.record("imported", entry, imported)
+            else:
+                # Left pending, so the next run retries it
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"No rows of {entry.path} were imported; not marking it imported"
+                    )
+                )
+
+    @staticmethod
+    def plain_values(df):
+        """Compact / Parquet dtypes (nullable Int8, categoricals, Arrow strings)
+        mark missing values with pd.NA, which the model's rating checks cannot
+        compare; use None."""
+        return df.astype(object).where(df.notna(), None)
+
     def import_data(self, df, business_name, source):
         total_rows = len(df)
         success_count = 0
@@ -175,3 +241,4 @@ class Command(BaseCommand):
                 f"Successfully imported {success_count}/{total_rows} reviews AND {subcategory_count} subcategory reviews"
             )
         )
+        return success_count
@@ -194,6 +194,34 @@ class ScrapeEventManager(models.Manager):
         # Returns the newly created 'ScrapeEvent' Instances
         return events, subcategory_created
 
+    def review_watermark(
+        self,
+        business_name: str,
+        street: str,
+        city: str,
+        state: str,
+        zip: str,
+        limit: int = 200,
+    ):
+        """
+        Returns the most recent stored reviews for one store, newest first.
+
+        The scraper's incremental mode builds its high-water mark from these
+        rows (latest review_date + author/content fingerprints) and stops
+        scrolling as soon as it reaches one of them.
+        """
+        return list(
+            CustomerReview.objects.filter(
+                scrape_event__store__business__business_name=business_name.strip().upper(),
+                scrape_event__store__street=street.strip().upper(),
+                scrape_event__store__city=city.strip().upper(),
+                scrape_event__store__state=state.strip().upper(),
+                scrape_event__store__zip=zip.strip(),
+            )
+            .order_by("-review_date")
+            .values("first_name", "last_name", "review", "review_date")[:limit]
+        )
+
 
 class ScrapeEvent(models.Model):
     scrape_id = models.AutoField(primary_key=True)